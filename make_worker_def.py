@@ -29,7 +29,8 @@ container["command"] = [
     "macronome.backend.worker.config.celery_app", 
     "worker", 
     "--loglevel=info", 
-    "--pool=solo"
+    "--pool=threads",
+    "--concurrency=2"
 ]
 
 # Update log group to be distinct for worker
@@ -158,7 +158,12 @@ class AgentNode(Node, ABC):
                 return self.__get_google_vertex_ai_model(model_name)
 
     def __get_openai_model(self, model_name) -> Model:
-        return OpenAIChatModel(model_name=model_name)
+        # Node's own client, not pydantic-ai's process-wide cached one: worker threads
+        # each run their workflow in a separate event loop, and an httpx pool can't be shared
+        return OpenAIChatModel(
+            model_name=model_name,
+            provider=OpenAIProvider(http_client=self.__async_client),
+        )
 
     def __get_azure_openai_model(self, model_name) -> Model:
         client = AsyncAzureOpenAI(
@@ -181,7 +186,8 @@ class AgentNode(Node, ABC):
             raise KeyError("OLLAMA_BASE_URL not set in .env")
 
         return OpenAIChatModel(
-            model_name=model_name, provider=OpenAIProvider(base_url=base_url)
+            model_name=model_name,
+            provider=OpenAIProvider(base_url=base_url, http_client=self.__async_client),
         )
 
     def __get_bedrock_model(self, model_name: str) -> Model:
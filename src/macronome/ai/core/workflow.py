@@ -110,18 +110,25 @@ class Workflow(ABC):
         """
         return asyncio.run(self.__run(event))
 
-    async def run_async(self, event: Any) -> TaskContext:
+    async def run_async(
+        self, event: Any, metadata: Optional[Dict[str, Any]] = None
+    ) -> TaskContext:
         """Executes the workflow for a given event.
 
         Use this when you want to run the workflow in an active event loop for example in a FastAPI endpoint, or Jupyter Notebook.
         """
-        return await self.__run(event)
+        return await self.__run(event, metadata)
 
-    async def __run(self, event: Any) -> TaskContext:
+    async def __run(
+        self, event: Any, metadata: Optional[Dict[str, Any]] = None
+    ) -> TaskContext:
         """Executes the workflow for a given event.
 
         Args:
-            event: The event to process through the workflow
+            event: The event to process through the workflow, either a dict or
+                an instance of the workflow's event_schema
+            metadata: Optional initial task metadata (e.g. a stream queue for
+                nodes that emit partial output)
 
         Returns:
             TaskContext containing the results of workflow execution
@@ -129,10 +136,12 @@ class Workflow(ABC):
         Raises:
             Exception: Any exception that occurs during workflow execution
         """
-        task_context = TaskContext(event=event)
+        task_context = TaskContext(event=event, metadata=metadata or {})
 
         # Parse the raw event to the Pydantic schema defined in the WorkflowSchema
-        task_context.event = self.workflow_schema.event_schema(**event)
+        # (an already-validated instance of that schema is used as-is)
+        event_schema = self.workflow_schema.event_schema
+        task_context.event = event if isinstance(event, event_schema) else event_schema(**event)
 
         task_context.metadata["nodes"] = self.nodes
         current_node_class = self.workflow_schema.start
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from PIL.Image import Image
 from typing import List
 from io import BytesIO
@@ -24,7 +25,10 @@ class FoodClassifier:
         return result
 
     async def food_classifier_batch(self, imgs: List[Image]) -> List[str]:
-        img_bytes_list = [self._convert_image_to_bytes(img) for img in imgs]
+        # JPEG-encode every crop in one worker-thread pass, off the event loop
+        img_bytes_list = await asyncio.to_thread(
+            lambda: [self._convert_image_to_bytes(img) for img in imgs]
+        )
 
         results = await self.llm_client.analyze_image_batch(img_bytes_list, self.food_query_prompt)
 
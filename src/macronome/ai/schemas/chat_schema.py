@@ -48,6 +48,10 @@ class ChatRequest(BaseModel):
         default_factory=dict,
         description="Current user preferences from database (loaded by service layer)"
     )
+    prior_action: Optional[ChatAction] = Field(
+        None,
+        description="Intent chosen explicitly by the client (e.g. a 'Recommend a meal' button) - ChatRouter skips its LLM call"
+    )
     # Note: pantry_items are passed separately to meal recommender workflow when needed
 
 
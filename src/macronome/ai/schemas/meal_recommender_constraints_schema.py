@@ -1,5 +1,5 @@
 from typing import Optional, List, Dict, Set, Any
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 from macronome.backend.database.models import MacroConstraints
 
 class FilterConstraints(BaseModel):
@@ -32,6 +32,9 @@ class PantryItem(BaseModel):
     category: Optional[str] = None
     confirmed: bool = True
 
+# Built once - validates/dumps a whole pantry list in a single call
+PANTRY_ITEMS_ADAPTER = TypeAdapter(List[PantryItem])
+
 class MealRecommendationRequest(BaseModel):
     """Full request to workflow"""
     user_query: str                             # Free text: "something quick and spicy"
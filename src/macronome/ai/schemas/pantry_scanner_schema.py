@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from PIL.Image import Image
-from typing import List
+from typing import List, Optional
 
 
 class BoundingBox(BaseModel):
@@ -20,7 +20,8 @@ class PantryScanRequest(BaseModel):
     """Request schema for pantry scanner workflow"""
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
-    image: Image  # PIL Image
+    image: Image  # PIL Image (full resolution - items are cropped from it)
+    detection_image: Optional[Image] = None  # Downscaled copy for the detector (boxes mapped back to image)
     conf_threshold: float = 0.25  # Detection confidence threshold
     crop_padding: int = 10  # Pixels to add around crops
 
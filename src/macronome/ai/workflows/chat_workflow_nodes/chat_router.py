@@ -71,26 +71,35 @@ class ChatRouter(BaseRouter):
         
         request: ChatRequest = task_context.event
         
-        # Render the prompt with user message and chat history
-        prompt = PromptManager.get_prompt(
-            "chat_router",
-            message=request.message,
-            chat_history=request.chat_history,
-        )
-        
-        # Run the async agent synchronously
-        # Since we're in a sync function but need to call async code,
-        # we'll use asyncio.run() with nest_asyncio to handle nested loops
-        nest_asyncio.apply()
-        
-        result = asyncio.run(self.agent.run(user_prompt=prompt))
-        
-        # AgentRunResult has 'output' attribute, not 'data'
-        # See pydantic_ai/run.py line 292: output: OutputDataT
-        result_data = result.output
-        
-        # Get message history
-        history = to_jsonable_python(result.all_messages())
+        if request.prior_action is not None:
+            # Intent chosen explicitly by the client - skip the LLM call
+            result_data = ChatRouterOutput(
+                action=request.prior_action,
+                confidence=1.0,
+                reasoning="Action chosen explicitly by the client",
+            )
+            history = []
+        else:
+            # Render the prompt with user message and chat history
+            prompt = PromptManager.get_prompt(
+                "chat_router",
+                message=request.message,
+                chat_history=request.chat_history,
+            )
+            
+            # Run the async agent synchronously
+            # Since we're in a sync function but need to call async code,
+            # we'll use asyncio.run() with nest_asyncio to handle nested loops
+            nest_asyncio.apply()
+            
+            result = asyncio.run(self.agent.run(user_prompt=prompt))
+            
+            # AgentRunResult has 'output' attribute, not 'data'
+            # See pydantic_ai/run.py line 292: output: OutputDataT
+            result_data = result.output
+            
+            # Get message history
+            history = to_jsonable_python(result.all_messages())
         
         output = self.OutputType(model_output=result_data, history=history)
         self.save_output(output)
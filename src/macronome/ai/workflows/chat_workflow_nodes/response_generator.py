@@ -4,7 +4,8 @@ Response Generator Node
 Always runs at the end of chat workflow to generate the final response.
 Handles all three action types and mixed intents.
 """
-from typing import Any, Optional
+import asyncio
+from typing import Any, Optional, Tuple
 from pydantic_core import to_jsonable_python
 from pydantic import BaseModel, Field
 
@@ -15,6 +16,10 @@ from macronome.ai.schemas.chat_schema import ChatRequest, ChatAction
 from macronome.ai.workflows.chat_workflow_nodes.chat_router import ChatRouter
 from macronome.ai.workflows.chat_workflow_nodes.constraint_parser import ConstraintParser
 
+# task_context.metadata key for an asyncio.Queue that receives (event, data)
+# tuples while the response is generated (set by ChatService.stream_message)
+RESPONSE_STREAM_KEY = "response_stream"
+
 
 class ChatResponseOutput(BaseModel):
     """Final chat response output"""
@@ -101,14 +106,20 @@ class ResponseGenerator(AgentNode):
             task_id=task_id,
         )
         
-        # Run the agent to generate response
-        result = await self.agent.run(user_prompt=prompt)
-        
-        # Get response text
-        response_output: ChatResponseOutput = result.output
+        stream: Optional[asyncio.Queue] = task_context.metadata.get(RESPONSE_STREAM_KEY)
+        if stream is None:
+            # Run the agent to generate response
+            result = await self.agent.run(user_prompt=prompt)
+            response_output: ChatResponseOutput = result.output
+            messages = result.all_messages()
+        else:
+            # Action + task_id are known before the LLM call - send them first
+            # so the client can subscribe to the recommendation task immediately
+            stream.put_nowait(("start", {"action": action.value, "task_id": task_id}))
+            response_output, messages = await self._stream_response(prompt, stream)
         
         # Store output with message history
-        history = to_jsonable_python(result.all_messages())
+        history = to_jsonable_python(messages)
         output = self.OutputType(model_output=response_output, history=history)
         self.save_output(output)
         
@@ -116,4 +127,34 @@ class ResponseGenerator(AgentNode):
         task_context.should_stop = True
         
         return task_context
+    
+    async def _stream_response(
+        self, prompt: str, stream: asyncio.Queue
+    ) -> Tuple[ChatResponseOutput, list]:
+        """
+        Run the agent in streaming mode, pushing text deltas to the queue.
+        
+        Args:
+            prompt: Rendered response_generator prompt
+            stream: Queue receiving ("delta", {"text": ...}) tuples
+            
+        Returns:
+            Final ChatResponseOutput and the agent message history
+        """
+        sent = 0
+        async with self.agent.run_stream(user_prompt=prompt) as result:
+            # Partial outputs are cumulative - only forward the new suffix
+            async for partial in result.stream_output():
+                text = partial.response
+                if len(text) > sent:
+                    stream.put_nowait(("delta", {"text": text[sent:]}))
+                    sent = len(text)
+            response_output: ChatResponseOutput = await result.get_output()
+            messages = result.all_messages()
+        
+        # Flush anything the debounced partials did not cover
+        if len(response_output.response) > sent:
+            stream.put_nowait(("delta", {"text": response_output.response[sent:]}))
+        
+        return response_output, messages
 
@@ -6,6 +6,7 @@ from macronome.ai.core.task import TaskContext
 from macronome.ai.prompts import PromptManager
 from macronome.ai.schemas.meal_recommender_constraints_schema import (
     MealRecommendationRequest,
+    PANTRY_ITEMS_ADAPTER,
 )
 from macronome.ai.workflows.meal_recommender_workflow_nodes.modification_agent import ModificationAgent
 from macronome.ai.workflows.meal_recommender_workflow_nodes.normalize_node import NormalizeNode
@@ -101,7 +102,7 @@ class ExplanationAgent(AgentNode):
             normalized_constraints=normalized_dict,
             recipe=modified.model_dump(),
             nutrition=nutrition.model_dump(),
-            pantry_items=[item.model_dump() for item in request.pantry_items if item.confirmed],
+            pantry_items=PANTRY_ITEMS_ADAPTER.dump_python([item for item in request.pantry_items if item.confirmed]),
         )
         
         # Run the agent
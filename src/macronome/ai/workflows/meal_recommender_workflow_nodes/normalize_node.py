@@ -6,6 +6,7 @@ from macronome.ai.core.task import TaskContext
 from macronome.ai.prompts import PromptManager
 from macronome.ai.schemas.meal_recommender_constraints_schema import (
     MealRecommendationRequest,
+    PANTRY_ITEMS_ADAPTER,
     NormalizedConstraints,
 )
 
@@ -71,7 +72,7 @@ class NormalizeNode(AgentNode):
             "normalize",
             user_query=request.user_query,
             constraints=request.constraints.model_dump(),
-            pantry_items=[item.model_dump() for item in request.pantry_items],
+            pantry_items=PANTRY_ITEMS_ADAPTER.dump_python(request.pantry_items),
             chat_history=request.chat_history,
         )
         
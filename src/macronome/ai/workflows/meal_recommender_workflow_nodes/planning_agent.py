@@ -4,7 +4,7 @@ from pydantic_core import to_jsonable_python
 from macronome.ai.core.nodes.agent import AgentNode, AgentConfig, ModelProvider
 from macronome.ai.core.task import TaskContext
 from macronome.ai.prompts import PromptManager
-from macronome.ai.schemas.meal_recommender_constraints_schema import MealRecommendationRequest
+from macronome.ai.schemas.meal_recommender_constraints_schema import MealRecommendationRequest, PANTRY_ITEMS_ADAPTER
 from macronome.ai.schemas.workflow_schemas import PlanningOutput
 
 """
@@ -83,7 +83,7 @@ class PlanningAgent(AgentNode):
         prompt = PromptManager.get_prompt(
             "planning",
             normalized_constraints=constraints_dict,
-            pantry_items=[item.model_dump() for item in request.pantry_items],
+            pantry_items=PANTRY_ITEMS_ADAPTER.dump_python(request.pantry_items),
         )
         
         # Run the agent to get structured planning output
@@ -1,6 +1,8 @@
 import json
 import logging
-from typing import List
+import threading
+from functools import lru_cache
+from typing import Any, List, Tuple
 import numpy as np
 
 from sentence_transformers import SentenceTransformer
@@ -15,7 +17,9 @@ from macronome.data_engineering.config import (
     RECIPES_PROCESSED_DIR,
     EMBEDDINGS_FAISS,
     METADATA_JSON,
+    METADATA_PARQUET,
     EMBEDDING_MODEL,
+    FAISS_HNSW_EF_SEARCH,
 )
 from macronome.settings import DataConfig
 
@@ -29,6 +33,93 @@ Retrieves top candidate recipes based on planning strategy.
 """
 
 
+# Loaded once per process and shared by every RetrievalNode (worker threads
+# included), so concurrent tasks don't each hold a model / index / metadata copy
+_LOAD_LOCK = threading.Lock()
+# HF fast tokenizers must not be called from several threads at once
+_ENCODE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_embedding_model() -> SentenceTransformer:
+    """Load the query embedding model (needed for both FAISS and Qdrant)"""
+    logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+@lru_cache(maxsize=1)
+def _get_faiss_data() -> Tuple[Any, List[Recipe]]:
+    """Load FAISS index and local metadata"""
+    # Lazy import - only import FAISS when actually needed (not in prod when using Qdrant)
+    import faiss
+    
+    # Load FAISS index
+    index_path = RECIPES_PROCESSED_DIR / EMBEDDINGS_FAISS
+    if not index_path.exists():
+        raise FileNotFoundError(
+            f"FAISS index not found at {index_path}. "
+            f"Run generate_embeddings.py first."
+        )
+    
+    logger.info(f"Loading FAISS index from {index_path}")
+    faiss_index = faiss.read_index(str(index_path))
+    if hasattr(faiss_index, "hnsw"):
+        faiss_index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+    
+    # Load recipe metadata (parquet, row i == FAISS vector i)
+    parquet_path = RECIPES_PROCESSED_DIR / METADATA_PARQUET
+    metadata_path = RECIPES_PROCESSED_DIR / METADATA_JSON
+    if parquet_path.exists():
+        import pyarrow.parquet as pq
+        
+        logger.info(f"Loading recipe metadata from {parquet_path}")
+        recipes_data = pq.read_table(parquet_path).to_pylist()
+    elif metadata_path.exists():
+        # Legacy JSON metadata (from older generate_embeddings.py runs)
+        logger.info(f"Loading recipe metadata from {metadata_path}")
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+        # {"recipe_id_to_index": {...}, "recipes": [...]} or just a list of recipes
+        if isinstance(metadata, dict) and "recipes" in metadata:
+            recipes_data = metadata["recipes"]
+        else:
+            recipes_data = metadata
+    else:
+        raise FileNotFoundError(
+            f"Recipe metadata not found at {parquet_path}. "
+            f"Run generate_embeddings.py first."
+        )
+    recipes = [Recipe(**r) for r in recipes_data]
+    
+    logger.info(f"Loaded {len(recipes)} recipes")
+    return faiss_index, recipes
+
+
+@lru_cache(maxsize=1)
+def _get_qdrant_client() -> QdrantClient:
+    """Initialize Qdrant client (no S3 loading needed - recipes built from payloads)"""
+    if not DataConfig.QDRANT_URL or not DataConfig.QDRANT_API_KEY:
+        raise ValueError("QDRANT_URL and QDRANT_API_KEY must be set in environment")
+    
+    logger.info(f"Connecting to Qdrant at {DataConfig.QDRANT_URL}")
+    client = QdrantClient(
+        url=DataConfig.QDRANT_URL,
+        api_key=DataConfig.QDRANT_API_KEY,
+    )
+    
+    # Verify collection exists
+    collection_name = DataConfig.QDRANT_COLLECTION_NAME
+    try:
+        collection_info = client.get_collection(collection_name)
+        logger.info(f"Connected to Qdrant collection '{collection_name}' with {collection_info.points_count} recipes")
+    except Exception as e:
+        raise RuntimeError(
+            f"Failed to connect to Qdrant collection '{collection_name}': {e}. "
+            f"Run generate_embeddings.py first."
+        )
+    return client
+
+
 class RetrievalNode(Node):
     """
     Third node in meal recommendation workflow.
@@ -60,87 +151,22 @@ class RetrievalNode(Node):
         pass
     
     def _load_index_and_recipes(self):
-        """Load vector index (FAISS or Qdrant) and recipe metadata (lazy loading)"""
+        """Attach the shared vector index (FAISS or Qdrant) and embedding model (lazy loading)"""
         if self._model is not None:
             return  # Already loaded
         
-        # Load embedding model (needed for both FAISS and Qdrant)
-        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
-        self._model = SentenceTransformer(EMBEDDING_MODEL)
-        
-        if self._use_qdrant:
-            self._load_qdrant()
-        else:
-            self._load_faiss()
-    
-    def _load_faiss(self):
-        """Load FAISS index and local metadata"""
-        if self._faiss_index is not None:
-            return
-        
-        # Lazy import - only import FAISS when actually needed (not in prod when using Qdrant)
-        import faiss
-        
-        # Load FAISS index
-        index_path = RECIPES_PROCESSED_DIR / EMBEDDINGS_FAISS
-        if not index_path.exists():
-            raise FileNotFoundError(
-                f"FAISS index not found at {index_path}. "
-                f"Run generate_embeddings.py first."
-            )
-        
-        logger.info(f"Loading FAISS index from {index_path}")
-        self._faiss_index = faiss.read_index(str(index_path))
-        
-        # Load recipe metadata (new format has "recipes" key)
-        metadata_path = RECIPES_PROCESSED_DIR / METADATA_JSON
-        if not metadata_path.exists():
-            raise FileNotFoundError(
-                f"Recipe metadata not found at {metadata_path}. "
-                f"Run generate_embeddings.py first."
-            )
-        
-        logger.info(f"Loading recipe metadata from {metadata_path}")
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
-            # New format: {"recipe_id_to_index": {...}, "recipes": [...]}
-            if isinstance(metadata, dict) and "recipes" in metadata:
-                recipes_data = metadata["recipes"]
+        with _LOAD_LOCK:
+            if self._use_qdrant:
+                self._qdrant_client = _get_qdrant_client()
             else:
-                # Legacy format: just a list of recipes
-                recipes_data = metadata
-            self._recipes = [Recipe(**r) for r in recipes_data]
-        
-        logger.info(f"Loaded {len(self._recipes)} recipes")
-    
-    def _load_qdrant(self):
-        """Initialize Qdrant client (no S3 loading needed - recipes built from payloads)"""
-        if self._qdrant_client is not None:
-            return
-        
-        if not DataConfig.QDRANT_URL or not DataConfig.QDRANT_API_KEY:
-            raise ValueError("QDRANT_URL and QDRANT_API_KEY must be set in environment")
-        
-        logger.info(f"Connecting to Qdrant at {DataConfig.QDRANT_URL}")
-        self._qdrant_client = QdrantClient(
-            url=DataConfig.QDRANT_URL,
-            api_key=DataConfig.QDRANT_API_KEY,
-        )
-        
-        # Verify collection exists
-        collection_name = DataConfig.QDRANT_COLLECTION_NAME
-        try:
-            collection_info = self._qdrant_client.get_collection(collection_name)
-            logger.info(f"Connected to Qdrant collection '{collection_name}' with {collection_info.points_count} recipes")
-        except Exception as e:
-            raise RuntimeError(
-                f"Failed to connect to Qdrant collection '{collection_name}': {e}. "
-                f"Run generate_embeddings.py first."
-            )
+                self._faiss_index, self._recipes = _get_faiss_data()
+            self._model = _get_embedding_model()
     
     def _embed_query(self, query: str) -> np.ndarray:
         """Embed search query using sentence-transformers"""
-        embedding = self._model.encode([query], convert_to_numpy=True)
+        # Unit-normalized so FAISS inner product equals cosine similarity
+        with _ENCODE_LOCK:
+            embedding = self._model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
         return embedding.astype('float32')
     
     def _semantic_search(self, query: str, top_k: int) -> List[Recipe]:
@@ -152,19 +178,29 @@ class RetrievalNode(Node):
     
     def _semantic_search_faiss(self, query: str, top_k: int) -> List[tuple]:
         """Perform FAISS semantic search"""
+        import faiss
+        
         # Embed query
         query_embedding = self._embed_query(query)
         
         # Search FAISS index
-        distances, indices = self._faiss_index.search(query_embedding, top_k * 2)  # Get more for filtering
+        scores, indices = self._faiss_index.search(query_embedding, top_k * 2)  # Get more for filtering
+        
+        # Inner-product indexes return cosine similarity (normalized vectors); legacy
+        # L2 indexes return distances, where larger is worse
+        is_inner_product = self._faiss_index.metric_type == faiss.METRIC_INNER_PRODUCT
         
         # Get recipes
         results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx < len(self._recipes):
+        for score, idx in zip(scores[0], indices[0]):
+            # HNSW pads with -1 when fewer than k neighbors are found
+            if 0 <= idx < len(self._recipes):
                 recipe = self._recipes[int(idx)]
-                # Add semantic score (convert distance to similarity)
-                results.append((recipe, float(1 / (1 + dist))))
+                if is_inner_product:
+                    results.append((recipe, float(score)))
+                else:
+                    # Convert L2 distance to similarity
+                    results.append((recipe, float(1 / (1 + score))))
         
         return results
     
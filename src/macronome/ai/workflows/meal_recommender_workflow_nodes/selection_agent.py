@@ -7,6 +7,7 @@ from macronome.ai.prompts import PromptManager
 from macronome.ai.workflows.meal_recommender_workflow_nodes.normalize_node import NormalizeNode
 from macronome.ai.schemas.meal_recommender_constraints_schema import (
     MealRecommendationRequest,
+    PANTRY_ITEMS_ADAPTER,
 )
 from macronome.ai.schemas.workflow_schemas import SelectionOutput
 
@@ -85,7 +86,7 @@ class SelectionAgent(AgentNode):
         prompt = PromptManager.get_prompt(
             "selection",
             normalized_constraints=normalized_dict,
-            pantry_items=[item.model_dump() for item in request.pantry_items],
+            pantry_items=PANTRY_ITEMS_ADAPTER.dump_python(request.pantry_items),
             candidates=[recipe.model_dump() for recipe in candidates],
         )
         
@@ -5,6 +5,7 @@ Second node in pantry scanner workflow.
 Crops detected items from image with padding.
 """
 from __future__ import annotations
+import asyncio
 import logging
 from typing import List
 
@@ -138,8 +139,9 @@ class CroppingNode(Node):
         
         logger.info(f"✂️  Cropping {len(items)} items...")
         
-        # Crop items with padding
-        cropped_images = self._crop_items_with_padding(
+        # Crop items with padding (pixel copies - keep them off the event loop)
+        cropped_images = await asyncio.to_thread(
+            self._crop_items_with_padding,
             request.image,
             items,
             padding=request.crop_padding
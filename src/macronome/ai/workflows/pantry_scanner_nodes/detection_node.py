@@ -57,7 +57,7 @@ class DetectionNode(Node):
             
             # Convert PIL Image to bytes for HTTP transmission
             # Ensure RGB mode (required for JPEG)
-            pil_image = request.image
+            pil_image = request.image if request.detection_image is None else request.detection_image
             if pil_image.mode != "RGB":
                 pil_image = pil_image.convert("RGB")
             
@@ -80,15 +80,19 @@ class DetectionNode(Node):
                 result = response.json()
                 items_dict = result["items"]
             
+            # Boxes from a downscaled detection image are mapped back to full-image pixels
+            sx = request.image.width / pil_image.width
+            sy = request.image.height / pil_image.height
+            
             # Convert response dicts back to PantryItem objects
             items = [
                 PantryItem(
                     id=item_dict["id"],
                     bounding_box=BoundingBox(
-                        x=item_dict["bounding_box"]["x"],
-                        y=item_dict["bounding_box"]["y"],
-                        width=item_dict["bounding_box"]["width"],
-                        height=item_dict["bounding_box"]["height"],
+                        x=int(item_dict["bounding_box"]["x"] * sx),
+                        y=int(item_dict["bounding_box"]["y"] * sy),
+                        width=int(item_dict["bounding_box"]["width"] * sx),
+                        height=int(item_dict["bounding_box"]["height"] * sy),
                     ),
                     confidence=item_dict["confidence"],
                 )
@@ -6,7 +6,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status, Header
 from supabase import Client
 
-from macronome.backend.auth.clerk import clerk_auth
+from macronome.backend.auth.clerk import get_clerk_auth
 from macronome.backend.database.session import get_db, get_admin_db
 
 
@@ -47,7 +47,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> str:
         )
     
     # Verify token
-    user_data = clerk_auth.verify_token(token)
+    user_data = get_clerk_auth().verify_token(token)
     if not user_data:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
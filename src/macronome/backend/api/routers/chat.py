@@ -2,20 +2,23 @@
 Chat Router
 ML chat workflow (streaming) and chat session CRUD
 """
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from supabase import Client
 
 from macronome.backend.api.dependencies import get_current_user, get_supabase, get_supabase_admin
 from macronome.backend.database.models import ChatSession, ChatMessage
-from macronome.ai.schemas.chat_schema import ChatResponse
+from macronome.ai.schemas.chat_schema import ChatAction, ChatResponse
 from pydantic import BaseModel
 from macronome.backend.services.chat import ChatService
 from macronome.backend.database.chat_helpers import (
-    get_active_chat_session,
+    get_chat_context,
     create_new_chat_session,
     add_chat_message,
+    add_chat_turn,
     get_chat_messages,
 )
 
@@ -28,6 +31,7 @@ class ChatMessageRequest(BaseModel):
     """Send chat message - minimal API input"""
     message: str
     chat_session_id: Optional[str] = None  # Create new if not provided
+    action: Optional[ChatAction] = None  # Explicit intent (e.g. "Recommend a meal" button) - skips the LLM router
 
 
 class ChatSessionCreate(BaseModel):
@@ -35,6 +39,87 @@ class ChatSessionCreate(BaseModel):
     filters: Optional[dict] = None
 
 
+async def _load_chat_context(
+    db: Client, user_id: str, chat_session_id: Optional[str]
+) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Resolve the chat session and load the user's preferences and recent history.
+    
+    Pantry items are not loaded here - MealRecommendationTrigger fetches them
+    only when a recommendation is actually queued.
+    
+    Returns:
+        (chat_session_id, user_preferences, recent_messages)
+    """
+    # Session (given or active) + last messages + preferences in one round trip
+    context = await asyncio.to_thread(get_chat_context, db, user_id, chat_session_id)
+    
+    session = context["session"]
+    if session:
+        chat_session_id = session["id"]
+        recent_messages = context["messages"]
+    elif chat_session_id:
+        # Unknown id, or a session that belongs to another user
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chat session not found"
+        )
+    else:
+        # No active session yet - start one
+        new_session = await asyncio.to_thread(create_new_chat_session, db, user_id)
+        chat_session_id = new_session["id"]
+        recent_messages = []
+    
+    user_preferences = context["preferences"] or {}
+    
+    return chat_session_id, user_preferences, recent_messages
+
+
+def _save_chat_results(
+    db: Client,
+    user_id: str,
+    chat_session_id: str,
+    message: str,
+    user_preferences: Dict[str, Any],
+    response: Dict[str, Any],
+) -> None:
+    """Persist the chat turn and any updated constraints (blocking - run in a thread)"""
+    # Save user message + assistant response to history in one round trip
+    add_chat_turn(db, chat_session_id, message, response["response"])
+    
+    # If constraints were updated, save to database
+    if response.get("updated_constraints"):
+        updated_constraints = response["updated_constraints"]
+        logger.info(f"📝 Saving updated constraints: {updated_constraints.keys()}")
+        
+        # Update or create user_preferences
+        if user_preferences:
+            db.table("user_preferences").update(updated_constraints).eq("user_id", user_id).execute()
+        else:
+            db.table("user_preferences").insert({
+                "user_id": user_id,
+                **updated_constraints
+            }).execute()
+        
+        logger.info(f"✅ Updated user preferences for user {user_id}")
+
+
+def _save_unanswered_message(db: Client, chat_session_id: str, message: str) -> None:
+    """
+    Persist the user message of a turn that failed or was cancelled
+    
+    Submitted to the default executor without awaiting it, so the write still
+    happens when the request task is being cancelled (client disconnected).
+    """
+    def save() -> None:
+        try:
+            add_chat_message(db, chat_session_id, message, "user")
+        except Exception as e:
+            logger.error(f"❌ Failed to save user message for session {chat_session_id}: {e}")
+    
+    asyncio.get_running_loop().run_in_executor(None, save)
+
+
 @router.post("/message", tags=["ml", "chat"], response_model=ChatResponse)
 async def send_chat_message(
     request: ChatMessageRequest,
@@ -56,59 +141,32 @@ async def send_chat_message(
     logger.info(f"💬 Processing chat message for user {user_id}")
     
     try:
-        # Get or create chat session
-        chat_session_id = request.chat_session_id
-        if not chat_session_id:
-            # Get active session or create new one
-            active_session = get_active_chat_session(db, user_id)
-            if active_session:
-                chat_session_id = active_session["id"]
-            else:
-                new_session = create_new_chat_session(db, user_id)
-                chat_session_id = new_session["id"]
-        
-        # Save user message to history
-        add_chat_message(db, chat_session_id, request.message, "user")
-        
-        # Get user preferences
-        prefs_result = db.table("user_preferences").select("*").eq("user_id", user_id).limit(1).execute()
-        user_preferences = prefs_result.data[0] if prefs_result.data else {}
-        
-        # Get pantry items
-        pantry_result = db.table("pantry_items").select("*").eq("user_id", user_id).execute()
-        pantry_items = [
-            {"name": item["name"], "category": item.get("category"), "confirmed": item["confirmed"]}
-            for item in pantry_result.data
-        ]
-        
-        # Process message through chat service
-        chat_service = ChatService()
-        response = await chat_service.process_message(
-            message=request.message,
-            chat_session_id=chat_session_id,
-            user_id=user_id,
-            user_preferences=user_preferences,
-            pantry_items=pantry_items,
+        chat_session_id, user_preferences, recent_messages = await _load_chat_context(
+            db, user_id, request.chat_session_id
         )
         
-        # Save assistant response to history
-        add_chat_message(db, chat_session_id, response["response"], "assistant")
-        
-        # If constraints were updated, save to database
-        if response.get("updated_constraints"):
-            updated_constraints = response["updated_constraints"]
-            logger.info(f"📝 Saving updated constraints: {updated_constraints.keys()}")
-            
-            # Update or create user_preferences
-            if user_preferences:
-                db.table("user_preferences").update(updated_constraints).eq("user_id", user_id).execute()
-            else:
-                db.table("user_preferences").insert({
-                    "user_id": user_id,
-                    **updated_constraints
-                }).execute()
+        # The turn is saved in one round trip once it completes; the user message
+        # alone is kept if it fails or is cancelled
+        turn_saved = False
+        try:
+            # Process message through chat service
+            chat_service = ChatService()
+            response = await chat_service.process_message(
+                message=request.message,
+                chat_session_id=chat_session_id,
+                user_id=user_id,
+                user_preferences=user_preferences,
+                recent_messages=recent_messages,
+                action=request.action,
+            )
             
-            logger.info(f"✅ Updated user preferences for user {user_id}")
+            await asyncio.to_thread(
+                _save_chat_results, db, user_id, chat_session_id, request.message, user_preferences, response
+            )
+            turn_saved = True
+        finally:
+            if not turn_saved:
+                _save_unanswered_message(db, chat_session_id, request.message)
         
         logger.info(f"✅ Chat message processed for user {user_id}")
         
@@ -120,6 +178,8 @@ async def send_chat_message(
             chat_session_id=chat_session_id,
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Failed to process chat message for user {user_id}: {e}")
         raise HTTPException(
@@ -128,11 +188,60 @@ async def send_chat_message(
         )
 
 
-# TODO: Implement streaming version
-# @router.post("/message/stream", tags=["ml", "chat"])
-# async def send_chat_message_stream(...):
-#     """Streaming version using SSE"""
-#     pass
+@router.post("/message/stream", tags=["ml", "chat"])
+async def send_chat_message_stream(
+    request: ChatMessageRequest,
+    user_id: str = Depends(get_current_user),
+    db: Client = Depends(get_supabase_admin),  # Use admin to bypass RLS for writes
+):
+    """
+    AI: Send chat message (streaming version, Server-Sent Events)
+    
+    Same processing as POST /message, but the response text is streamed as it
+    is generated:
+    - start: action and task_id (subscribe to the recommendation task right away)
+    - delta: next chunk of response text
+    - done: final ChatResponse (sent after the turn is saved)
+    - error: processing failed
+    """
+    logger.info(f"💬 Streaming chat message for user {user_id}")
+    
+    try:
+        chat_session_id, user_preferences, recent_messages = await _load_chat_context(
+            db, user_id, request.chat_session_id
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to load chat context for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process message: {str(e)}"
+        )
+    
+    async def save_results(response: Dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            _save_chat_results, db, user_id, chat_session_id, request.message, user_preferences, response
+        )
+    
+    def save_user_message() -> None:
+        _save_unanswered_message(db, chat_session_id, request.message)
+    
+    chat_service = ChatService()
+    return StreamingResponse(
+        chat_service.stream_message(
+            message=request.message,
+            chat_session_id=chat_session_id,
+            user_id=user_id,
+            user_preferences=user_preferences,
+            recent_messages=recent_messages,
+            action=request.action,
+            on_complete=save_results,
+            on_abort=save_user_message,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/sessions", tags=["chat"], response_model=List[ChatSession])
@@ -151,10 +260,7 @@ async def get_chat_sessions(
     try:
         result = db.table("chat_sessions").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(limit).execute()
         
-        sessions = [
-            ChatSession(**session)
-            for session in result.data
-        ]
+        sessions = result.data
         
         logger.info(f"✅ Found {len(sessions)} chat sessions for user {user_id}")
         
@@ -223,10 +329,7 @@ async def get_session_messages(
         # Get messages
         messages_data = get_chat_messages(db, session_id, limit)
         
-        messages = [
-            ChatMessage(**msg)
-            for msg in messages_data
-        ]
+        messages = messages_data
         
         logger.info(f"✅ Found {len(messages)} messages for session {session_id}")
         
@@ -5,6 +5,7 @@ ML meal recommendations and meal history CRUD
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from supabase import Client
 
 from macronome.backend.api.dependencies import get_current_user, get_supabase
@@ -16,6 +17,12 @@ from macronome.backend.services.meal_recommender import MealRecommenderService
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Meal history columns - the ones POST /history writes, plus the row metadata
+MEAL_HISTORY_COLUMNS = (
+    "id,user_id,chat_session_id,name,description,ingredients,reasoning,"
+    "meal_data,accepted,rating,created_at"
+)
+
 
 # API-specific schemas for meal operations
 class MealRecommendRequest(BaseModel):
@@ -126,6 +133,7 @@ async def recommend_meal(
 @router.get("/recommend/{task_id}", tags=["ml", "meals"], response_model=MealRecommendStatusResponse)
 async def get_recommendation_status(
     task_id: str,
+    response: Response,
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -145,6 +153,9 @@ async def get_recommendation_status(
         recommender = MealRecommenderService()
         status_result = recommender.get_task_status(task_id)
         
+        # Polled repeatedly - never serve a cached status
+        response.headers["Cache-Control"] = "no-store"
+        
         return MealRecommendStatusResponse(**status_result)
     
     except Exception as e:
@@ -169,12 +180,9 @@ async def get_meal_history(
     logger.info(f"📜 Fetching meal history for user {user_id}")
     
     try:
-        result = db.table("meal_recommendations").select("*").eq("user_id", user_id).order("created_at", desc=True).limit(limit).execute()
+        result = db.table("meal_recommendations").select(MEAL_HISTORY_COLUMNS).eq("user_id", user_id).order("created_at", desc=True).limit(limit).execute()
         
-        meals = [
-            MealRecommendation(**meal)
-            for meal in result.data
-        ]
+        meals = result.data
         
         logger.info(f"✅ Found {len(meals)} meals in history for user {user_id}")
         
@@ -3,18 +3,18 @@ Pantry Router
 ML scanning and CRUD operations for pantry items
 """
 import logging
-import io
+import asyncio
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query
 from supabase import Client
-from PIL import Image
 
 from macronome.backend.api.dependencies import get_current_user, get_supabase, get_supabase_admin
 from macronome.backend.database.models import PantryItem
-from macronome.backend.storage import storage
+from macronome.ai.schemas.pantry_scanner_schema import PantryItem as DetectionItem
+from macronome.backend.storage import get_storage
 from macronome.backend.services.detection import DetectionService
-from pydantic import BaseModel
-from macronome.backend.services.pantry_scanner import PantryScannerService
+from pydantic import BaseModel, TypeAdapter
+from macronome.backend.services.pantry_scanner import PantryScannerService, decode_image
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,13 @@ class DetectedItem(BaseModel):
     bounding_box: Optional[Dict[str, int]] = None
 
 
+# Built once - validates a whole scan result list in a single call
+DETECTED_ITEMS_ADAPTER = TypeAdapter(List[DetectedItem])
+
+# Built once - dumps a whole detection list (YOLO boxes, no names) in a single call
+DETECTION_ITEMS_ADAPTER = TypeAdapter(List[DetectionItem])
+
+
 class PantryScanResponse(BaseModel):
     """Response from pantry scan endpoint"""
     items: List[DetectedItem]
@@ -91,31 +98,14 @@ async def detect_items(
         )
     
     try:
-        # Read image bytes
-        image_bytes = await file.read()
-        
-        # Convert to PIL Image
-        pil_image = Image.open(io.BytesIO(image_bytes))
-        if pil_image.mode != "RGB":
-            pil_image = pil_image.convert("RGB")
+        # Convert to PIL Image - decoded off the event loop, straight from the upload's spooled file
+        pil_image = await asyncio.to_thread(decode_image, file.file)
         
         # Call DetectionService
         detected_items = await DetectionService.detect(pil_image, conf_threshold=conf_threshold)
         
-        # Convert PantryItem objects to dicts for JSON serialization
-        items_dict = [
-            {
-                "id": item.id,
-                "bounding_box": {
-                    "x": item.bounding_box.x,
-                    "y": item.bounding_box.y,
-                    "width": item.bounding_box.width,
-                    "height": item.bounding_box.height,
-                },
-                "confidence": item.confidence,
-            }
-            for item in detected_items
-        ]
+        # Convert PantryItem objects to dicts for JSON serialization (one serializer call)
+        items_dict = DETECTION_ITEMS_ADAPTER.dump_python(detected_items)
         
         logger.info(f"✅ Detected {len(items_dict)} items")
         
@@ -129,6 +119,29 @@ async def detect_items(
         )
 
 
+def _save_scan_image(db: Client, user_id: str, file: UploadFile, filename: str) -> Optional[str]:
+    """Upload the scan image to storage and record it in pantry_images (blocking - run in a thread)"""
+    # Streamed from the upload's spooled file, never held as bytes
+    storage_url = get_storage().upload_image(user_id, file.file, filename)
+    
+    # Save image record to database
+    image_record = {
+        "user_id": user_id,
+        "storage_url": storage_url,
+        "uploaded_at": datetime.utcnow().isoformat(),
+        "metadata": {
+            "filename": filename,
+            "content_type": file.content_type,
+            "size": file.size,
+        }
+    }
+    image_result = db.table("pantry_images").insert(image_record).execute()
+    image_id = image_result.data[0]["id"] if image_result.data else None
+    
+    logger.info(f"💾 Saved pantry image {image_id} to storage: {storage_url}")
+    return image_id
+
+
 @router.post("/scan", tags=["ml", "pantry"], response_model=PantryScanResponse)
 async def scan_pantry(
     file: UploadFile = File(...),
@@ -152,43 +165,22 @@ async def scan_pantry(
         )
     
     try:
-        # Read image bytes
-        image_bytes = await file.read()
-        
-        # Save image to storage
         filename = file.filename or "pantry-scan.jpg"
-        storage_url = storage.upload_image(user_id, image_bytes, filename)
-        
-        # Save image record to database
-        image_record = {
-            "user_id": user_id,
-            "storage_url": storage_url,
-            "uploaded_at": datetime.utcnow().isoformat(),
-            "metadata": {
-                "filename": filename,
-                "content_type": file.content_type,
-                "size": len(image_bytes),
-            }
-        }
-        image_result = db.table("pantry_images").insert(image_record).execute()
-        image_id = image_result.data[0]["id"] if image_result.data else None
         
-        logger.info(f"💾 Saved pantry image {image_id} to storage: {storage_url}")
+        # Decode straight from the spooled file (off the event loop). The image is
+        # fully loaded, so the file can be rewound for the storage upload.
+        pil_image = await asyncio.to_thread(decode_image, file.file)
+        await file.seek(0)
         
-        # Call pantry scanner service
+        # Storage upload + DB record run alongside the scan instead of before it
         scanner = PantryScannerService()
-        result = await scanner.scan_pantry(image_bytes)
+        image_id, result = await asyncio.gather(
+            asyncio.to_thread(_save_scan_image, db, user_id, file, filename),
+            scanner.scan_pantry(pil_image),
+        )
         
-        # Format response - result is already a list of item dicts
-        detected_items = [
-            DetectedItem(
-                name=item["name"],
-                category=item.get("category"),
-                confidence=item["confidence"],
-                bounding_box=item.get("bounding_box")
-            )
-            for item in result  # result is List[Dict], not a dict with "items" key
-        ]
+        # Format response - result is already a list of item dicts (extra keys ignored)
+        detected_items = DETECTED_ITEMS_ADAPTER.validate_python(result)
         
         logger.info(f"✅ Detected {len(detected_items)} items for user {user_id}")
         
@@ -221,10 +213,7 @@ async def get_pantry_items(
     try:
         result = db.table("pantry_items").select("*").eq("user_id", user_id).execute()
         
-        items = [
-            PantryItem(**item)
-            for item in result.data
-        ]
+        items = result.data
         
         logger.info(f"✅ Found {len(items)} pantry items for user {user_id}")
         
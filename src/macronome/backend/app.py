@@ -1,11 +1,17 @@
 from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from qdrant_client import AsyncQdrantClient
+import asyncio
 import logging
 
-from macronome.settings import BackendConfig, ENV
+from macronome.settings import BackendConfig, DataConfig, ENV
 from macronome.backend.cache import RedisCache
+from macronome.backend.database import get_supabase_client
+from macronome.backend.auth.clerk import get_clerk_auth
+from macronome.backend.services.detection import DetectionService
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +20,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Silence per-request HTTP client chatter (Supabase logs every call via httpx)
+for _noisy_logger in ("httpx", "urllib3"):
+    logging.getLogger(_noisy_logger).setLevel(logging.WARNING)
+
+# Per-dependency timeout for /health probes (seconds)
+HEALTH_PROBE_TIMEOUT = 1.0
+
+_qdrant_client: Optional[AsyncQdrantClient] = None
+
+
+async def _warm_redis():
+    """Open both Redis pools so the first request doesn't pay the connect"""
+    try:
+        await asyncio.to_thread(RedisCache.get_client)
+        await RedisCache.get_async_client().ping()
+        logger.info("✅ Redis connection initialized")
+    except Exception as e:
+        logger.warning(f"⚠️  Redis connection failed: {e}")
+
+
+async def _warm_jwks():
+    """Prefetch Clerk signing keys into the JWKS client cache"""
+    try:
+        clerk_auth = await asyncio.to_thread(get_clerk_auth)
+        if clerk_auth.jwks_client:
+            await asyncio.to_thread(clerk_auth.jwks_client.get_signing_keys)
+            logger.info("✅ JWKS signing keys cached")
+    except Exception as e:
+        logger.warning(f"⚠️  JWKS prefetch failed: {e}")
+
+
+async def _warm_db():
+    """Create the Supabase client up front"""
+    try:
+        await asyncio.to_thread(get_supabase_client)
+        logger.info("✅ Supabase client initialized")
+    except Exception as e:
+        logger.warning(f"⚠️  Supabase client init failed: {e}")
+
+
+async def _warm_detector():
+    """Load the YOLO pantry detector so the first scan doesn't pay the load"""
+    try:
+        await asyncio.to_thread(DetectionService.get_model)
+        logger.info("✅ Pantry detector loaded")
+    except Exception as e:
+        logger.warning(f"⚠️  Pantry detector load failed: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -22,17 +76,19 @@ async def lifespan(app: FastAPI):
     logger.info(f"🚀 Starting Macronome API in {ENV} mode")
     logger.info(f"📍 CORS origins: {BackendConfig.CORS_ORIGINS}")
     
-    # Initialize Redis connection
-    try:
-        RedisCache.get_client()
-        logger.info("✅ Redis connection initialized")
-    except Exception as e:
-        logger.warning(f"⚠️  Redis connection failed: {e}")
+    # Warm connections in parallel
+    warmups = [_warm_redis(), _warm_jwks(), _warm_db()]
+    if BackendConfig.YOLO_PRELOAD:
+        warmups.append(_warm_detector())
+    await asyncio.gather(*warmups)
     
     yield
     
     # Shutdown
     logger.info("👋 Shutting down Macronome API")
+    await RedisCache.close()
+    if _qdrant_client is not None:
+        await _qdrant_client.close()
 
 
 # Create FastAPI app
@@ -69,23 +125,59 @@ async def root():
     }
 
 
+async def _probe_redis() -> str:
+    """Ping Redis over the async client"""
+    return "up" if await RedisCache.async_health_check() else "down"
+
+
+async def _probe_db() -> str:
+    """Run a trivial Supabase query (sync client, so off the event loop)"""
+    def _ping():
+        get_supabase_client().table("user_preferences").select("user_id").limit(1).execute()
+    
+    await asyncio.to_thread(_ping)
+    return "up"
+
+
+async def _probe_qdrant() -> str:
+    """List Qdrant collections (only when Qdrant is the vector backend)"""
+    global _qdrant_client
+    
+    if DataConfig.VECTOR_BACKEND != "qdrant":
+        return "unknown"
+    
+    if _qdrant_client is None:
+        _qdrant_client = AsyncQdrantClient(
+            url=DataConfig.QDRANT_URL,
+            api_key=DataConfig.QDRANT_API_KEY,
+        )
+    await _qdrant_client.get_collections()
+    return "up"
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
-    services = {
-        "api": "up",
-        "redis": "down",
-        "database": "unknown",  # TODO: Add Supabase check
-        "vector_db": "unknown",  # TODO: Add Qdrant check
-        "worker": "unknown",  # TODO: Add Celery check
+    probes = {
+        "redis": _probe_redis(),
+        "database": _probe_db(),
+        "vector_db": _probe_qdrant(),
     }
     
-    # Check Redis
-    try:
-        if RedisCache.health_check():
-            services["redis"] = "up"
-    except Exception as e:
-        logger.warning(f"Redis health check failed: {e}")
+    # Run all probes concurrently, each capped by its own timeout
+    results = await asyncio.gather(
+        *(asyncio.wait_for(probe, timeout=HEALTH_PROBE_TIMEOUT) for probe in probes.values()),
+        return_exceptions=True
+    )
+    
+    services = {"api": "up"}
+    for name, result in zip(probes, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"{name} health check failed: {result!r}")
+            services[name] = "down"
+        else:
+            services[name] = result
+    services["worker"] = "unknown"  # TODO: Add Celery check
     
     # Determine overall status
     overall_status = "healthy" if services["redis"] == "up" else "degraded"
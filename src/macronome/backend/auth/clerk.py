@@ -3,14 +3,21 @@ Clerk authentication client
 """
 import jwt
 from jwt import PyJWKClient
+from functools import lru_cache
 from typing import Optional, Dict
 import logging
 import base64
+import re
 
 from macronome.settings import BackendConfig
 
 logger = logging.getLogger(__name__)
 
+# Structural limits checked before any JWKS / signature work
+MAX_TOKEN_LENGTH = 4096
+ALLOWED_ALGORITHMS = ["RS256"]
+KID_PATTERN = re.compile(r"[A-Za-z0-9_.\-]{1,128}")
+
 
 class ClerkAuth:
     """Clerk JWT verification"""
@@ -58,6 +65,10 @@ class ClerkAuth:
             self.instance_id = None
             logger.error("No publishable key provided")
         
+        # Expected claims - Clerk issues tokens from its frontend API domain
+        self.issuer = f"https://{self.instance_id}" if self.instance_id else None
+        self.audience = BackendConfig.CLERK_JWT_AUDIENCE or None
+        
         # JWKS URL for JWT verification
         # Clerk's JWKS URL format: https://{clerk_domain}/.well-known/jwks.json
         if self.instance_id:
@@ -94,8 +105,35 @@ class ClerkAuth:
                 logger.error(f"JWKS URL: {self.jwks_url if self.instance_id else 'N/A'}")
                 return None
             
-            logger.debug(f"Verifying token (first 50 chars): {token[:50]}...")
-            logger.debug(f"JWKS URL: {self.jwks_url}")
+            # Reject malformed tokens cheaply (must be header.payload.signature)
+            if token.count(".") != 2 or len(token) > MAX_TOKEN_LENGTH:
+                logger.warning("Rejected malformed token")
+                return None
+            
+            # Strict algorithm whitelist and sane key ID before hitting JWKS
+            header = jwt.get_unverified_header(token)
+            if header.get("alg") not in ALLOWED_ALGORITHMS:
+                logger.warning("Rejected token with unexpected alg: %s", header.get("alg"))
+                return None
+            if not isinstance(header.get("kid"), str) or not KID_PATTERN.fullmatch(header["kid"]):
+                logger.warning("Rejected token with missing or invalid kid")
+                return None
+            
+            # Reject tokens for another issuer/audience before JWKS + RSA verify
+            claims = jwt.decode(token, options={"verify_signature": False})
+            if claims.get("iss") != self.issuer:
+                logger.warning("Rejected token with unexpected issuer: %s", claims.get("iss"))
+                return None
+            if self.audience:
+                aud = claims.get("aud")
+                audiences = [aud] if isinstance(aud, str) else (aud or [])
+                if self.audience not in audiences:
+                    logger.warning("Rejected token with unexpected audience: %s", aud)
+                    return None
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Verifying token (first 50 chars): %s...", token[:50])
+                logger.debug("JWKS URL: %s", self.jwks_url)
             
             # Get signing key from JWKS
             signing_key = self.jwks_client.get_signing_key_from_jwt(token)
@@ -105,18 +143,20 @@ class ClerkAuth:
             payload = jwt.decode(
                 token,
                 signing_key.key,
-                algorithms=["RS256"],
+                algorithms=ALLOWED_ALGORITHMS,
+                audience=self.audience,
+                issuer=self.issuer,
                 options={"verify_exp": True}
             )
             
-            logger.debug(f"Token verified successfully for user: {payload.get('sub')}")
+            logger.debug("Token verified successfully for user: %s", payload.get("sub"))
             return payload
             
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
             return None
         except jwt.InvalidTokenError as e:
-            logger.warning(f"Invalid token: {e}")
+            logger.warning("Invalid token: %s", e)
             return None
         except Exception as e:
             logger.error(f"Error verifying token: {e}")
@@ -126,6 +166,13 @@ class ClerkAuth:
             return None
 
 
-# Singleton instance
-clerk_auth = ClerkAuth()
+@lru_cache(maxsize=1)
+def get_clerk_auth() -> ClerkAuth:
+    """
+    Get Clerk auth client (lazy singleton)
+    
+    Built on first use instead of at import so worker boot doesn't pay
+    for key decoding and JWKS client setup.
+    """
+    return ClerkAuth()
 
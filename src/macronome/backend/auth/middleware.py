@@ -6,7 +6,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict
 import logging
 
-from macronome.backend.auth.clerk import clerk_auth
+from macronome.backend.auth.clerk import get_clerk_auth
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +38,7 @@ async def get_current_user(
     token = credentials.credentials
     
     # Verify token
-    payload = clerk_auth.verify_token(token)
+    payload = get_clerk_auth().verify_token(token)
     
     if not payload:
         raise HTTPException(
@@ -47,7 +47,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    logger.debug(f"✅ Authenticated user: {payload.get('sub')}")
+    logger.debug("✅ Authenticated user: %s", payload.get("sub"))
     
     return payload
 
@@ -72,7 +72,7 @@ async def get_optional_user(
         return None
     
     token = credentials.credentials
-    payload = clerk_auth.verify_token(token)
+    payload = get_clerk_auth().verify_token(token)
     
     return payload
 
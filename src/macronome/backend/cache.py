@@ -6,22 +6,33 @@ Provides Redis connection and caching utilities for:
 - Session storage
 - General purpose caching
 """
+import asyncio
 import hashlib
 import json
 import logging
 from functools import wraps
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Iterator, List
 
 import redis
+import redis.asyncio as aioredis
 from macronome.settings import BackendConfig
 
 logger = logging.getLogger(__name__)
 
+_REDIS_URL = BackendConfig.REDIS_URL
+_LLM_CACHE_TTL = BackendConfig.LLM_CACHE_TTL
+
+# Reusable compact encoders - json.dumps() with custom kwargs builds a new
+# JSONEncoder on every call, these are built once
+_json_encoder = json.JSONEncoder(default=str, separators=(",", ":"))
+_json_key_encoder = json.JSONEncoder(default=str, separators=(",", ":"), sort_keys=True)
+
 
 class RedisCache:
     """Redis cache client with connection pooling"""
     
     _instance: Optional[redis.Redis] = None
+    _async_instance: Optional[aioredis.Redis] = None
     
     @classmethod
     def get_client(cls) -> redis.Redis:
@@ -34,7 +45,7 @@ class RedisCache:
         if cls._instance is None:
             try:
                 cls._instance = redis.from_url(
-                    BackendConfig.REDIS_URL,
+                    _REDIS_URL,
                     decode_responses=True,
                     socket_connect_timeout=5,
                     socket_keepalive=True,
@@ -49,6 +60,37 @@ class RedisCache:
         
         return cls._instance
     
+    @classmethod
+    def get_async_client(cls) -> aioredis.Redis:
+        """
+        Get asyncio Redis client (singleton with its own connection pool)
+        
+        Use this from async code so socket I/O doesn't block the event loop.
+        
+        Returns:
+            Async Redis client instance
+        """
+        if cls._async_instance is None:
+            cls._async_instance = aioredis.from_url(
+                _REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30
+            )
+        
+        return cls._async_instance
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close Redis connection pools (call on shutdown)"""
+        if cls._async_instance is not None:
+            await cls._async_instance.aclose()
+            cls._async_instance = None
+        if cls._instance is not None:
+            cls._instance.close()
+            cls._instance = None
+    
     @classmethod
     def health_check(cls) -> bool:
         """
@@ -63,6 +105,33 @@ class RedisCache:
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
             return False
+    
+    @classmethod
+    async def async_health_check(cls) -> bool:
+        """
+        Check Redis connection health without blocking the event loop
+        
+        Returns:
+            True if Redis is reachable, False otherwise
+        """
+        try:
+            client = cls.get_async_client()
+            return await client.ping()
+        except Exception as e:
+            logger.error(f"Redis health check failed: {e}")
+            return False
+
+
+# Strong references to in-flight background cache writes (avoids GC mid-write)
+_pending_writes: set = set()
+
+
+async def _async_cache_write(key: str, ttl: int, payload: str) -> None:
+    """Write a value with the async client, logging (not raising) failures"""
+    try:
+        await RedisCache.get_async_client().setex(key, ttl, payload)
+    except Exception as e:
+        logger.warning(f"Cache write error: {e}")
 
 
 def cache_llm_response(ttl: int = None) -> Callable:
@@ -78,7 +147,7 @@ def cache_llm_response(ttl: int = None) -> Callable:
             return await llm_call(prompt)
     """
     if ttl is None:
-        ttl = BackendConfig.LLM_CACHE_TTL
+        ttl = _LLM_CACHE_TTL
     
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -90,33 +159,32 @@ def cache_llm_response(ttl: int = None) -> Callable:
                 "kwargs": kwargs
             }
             key_hash = hashlib.sha256(
-                json.dumps(key_data, sort_keys=True, default=str).encode()
+                _json_key_encoder.encode(key_data).encode()
             ).hexdigest()
             cache_key = f"llm:{key_hash}"
             
-            # Try to get from cache
-            redis_client = RedisCache.get_client()
+            # Try to get from cache (async client - don't block the event loop)
             try:
-                cached_value = redis_client.get(cache_key)
+                cached_value = await RedisCache.get_async_client().get(cache_key)
                 if cached_value:
-                    logger.debug(f"Cache hit for {func.__name__}")
+                    logger.debug("Cache hit for %s", func.__name__)
                     return json.loads(cached_value)
             except Exception as e:
                 logger.warning(f"Cache read error: {e}")
             
             # Cache miss - call function
-            logger.debug(f"Cache miss for {func.__name__}")
+            logger.debug("Cache miss for %s", func.__name__)
             result = await func(*args, **kwargs)
             
-            # Store in cache
+            # Store in cache in the background so the caller isn't delayed
             try:
-                redis_client.setex(
-                    cache_key,
-                    ttl,
-                    json.dumps(result, default=str)
-                )
+                payload = _json_encoder.encode(result)
             except Exception as e:
                 logger.warning(f"Cache write error: {e}")
+            else:
+                task = asyncio.create_task(_async_cache_write(cache_key, ttl, payload))
+                _pending_writes.add(task)
+                task.add_done_callback(_pending_writes.discard)
             
             return result
         
@@ -141,7 +209,7 @@ def cache_set(key: str, value: Any, ttl: int = 3600) -> bool:
         redis_client.setex(
             key,
             ttl,
-            json.dumps(value, default=str)
+            _json_encoder.encode(value)
         )
         return True
     except Exception as e:
@@ -189,6 +257,25 @@ def cache_delete(key: str) -> bool:
         return False
 
 
+def _iter_scan(redis_client: redis.Redis, pattern: str, count: int = 500) -> Iterator[List[str]]:
+    """
+    Incrementally SCAN keys matching a pattern, yielding them in batches
+    
+    Args:
+        redis_client: Redis client
+        pattern: Redis key pattern
+        count: SCAN page size hint and batch size
+    """
+    batch = []
+    for key in redis_client.scan_iter(match=pattern, count=count):
+        batch.append(key)
+        if len(batch) >= count:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def cache_clear_pattern(pattern: str) -> int:
     """
     Clear all keys matching a pattern
@@ -201,10 +288,11 @@ def cache_clear_pattern(pattern: str) -> int:
     """
     try:
         redis_client = RedisCache.get_client()
-        keys = redis_client.keys(pattern)
-        if keys:
-            return redis_client.delete(*keys)
-        return 0
+        deleted = 0
+        # SCAN instead of KEYS so large keyspaces don't block the server
+        for key_batch in _iter_scan(redis_client, pattern):
+            deleted += redis_client.delete(*key_batch)
+        return deleted
     except Exception as e:
         logger.error(f"Cache clear error for pattern {pattern}: {e}")
         return 0
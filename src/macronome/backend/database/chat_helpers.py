@@ -9,22 +9,29 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def get_active_chat_session(db: Client, user_id: str) -> Optional[dict]:
+def get_chat_context(
+    db: Client, user_id: str, session_id: Optional[str] = None, history_limit: int = 5
+) -> dict:
     """
-    Get the active chat session for a user
+    Load everything a chat turn needs in one RPC
     
     Args:
         db: Supabase client
         user_id: Clerk user ID
+        session_id: Chat session ID (default: the user's active session)
+        history_limit: Number of most recent messages to include
     
     Returns:
-        Active chat session dict or None
+        Dict with 'session' (dict or None - also None if the session isn't the
+        user's), 'messages' (last messages, oldest first) and 'preferences'
+        (dict or None)
     """
-    result = db.table("chat_sessions").select("*").eq("user_id", user_id).eq("is_active", True).limit(1).execute()
-    
-    if result.data:
-        return result.data[0]
-    return None
+    result = db.rpc("get_chat_context", {
+        "p_user_id": user_id,
+        "p_session_id": session_id,
+        "p_history_limit": history_limit,
+    }).execute()
+    return result.data
 
 
 def create_new_chat_session(db: Client, user_id: str, filters: dict = None) -> dict:
@@ -128,3 +135,23 @@ def add_chat_message(db: Client, session_id: str, text: str, message_type: str =
     result = db.table("chat_messages").insert(new_message).execute()
     return result.data[0]
 
+
+def add_chat_turn(db: Client, session_id: str, user_text: str, assistant_text: str) -> dict:
+    """
+    Save a user message and the assistant reply in one RPC (single transaction)
+    
+    Args:
+        db: Supabase client
+        session_id: Chat session ID
+        user_text: User message content
+        assistant_text: Assistant response content
+    
+    Returns:
+        Dict with 'user_message' and 'assistant_message' rows
+    """
+    result = db.rpc("create_chat_turn", {
+        "p_session_id": session_id,
+        "p_user_text": user_text,
+        "p_assistant_text": assistant_text,
+    }).execute()
+    return result.data
@@ -3,11 +3,21 @@ Database models and schemas
 These represent the Supabase tables structure
 Aligned with frontend types in apps/mobile/src/types/
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
+# Shared by every table model: rows are read-only snapshots, so skip
+# re-validating/copying instances passed between models and ignore extra columns
+ROW_MODEL_CONFIG = ConfigDict(
+    from_attributes=True,
+    extra='ignore',
+    revalidate_instances='never',
+    frozen=True,
+)
+
+
 # ============================================================================
 # Pantry Models
 # ============================================================================
@@ -23,8 +33,7 @@ class PantryImage(BaseModel):
         description="Image metadata (filename, size, etc.)"
     )
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
 
 
 class PantryItem(BaseModel):
@@ -43,8 +52,7 @@ class PantryItem(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
 
 
 # ============================================================================
@@ -57,8 +65,7 @@ class MacroConstraints(BaseModel):
     protein: Optional[int] = None
     fat: Optional[int] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
 
 
 class UserPreferences(BaseModel):
@@ -87,8 +94,7 @@ class UserPreferences(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
 
 
 # ============================================================================
@@ -112,8 +118,7 @@ class ChatSession(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
 
 
 class ChatMessage(BaseModel):
@@ -126,8 +131,7 @@ class ChatMessage(BaseModel):
     type: str = Field(..., description="Message type: 'user', 'assistant', or 'system'")
     timestamp: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
 
 
 # ============================================================================
@@ -156,5 +160,132 @@ class MealRecommendation(BaseModel):
     rating: Optional[int] = Field(None, ge=1, le=5, description="User rating (1-5)")
     created_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ROW_MODEL_CONFIG
+
+
+# ============================================================================
+# SQL (column types / functions / indexes)
+# ============================================================================
+# Run in the Supabase SQL editor after the tables above exist.
+# Statements are idempotent so the whole block can be re-run on changes.
+
+SQL_SCHEMA = """
+-- String lists as native text[] instead of jsonb arrays: no JSON parsing on read,
+-- smaller rows, and GIN containment lookups (ingredients @> ARRAY['chicken']).
+-- PostgREST returns text[] as a JSON array, so API payloads are unchanged.
+CREATE OR REPLACE FUNCTION jsonb_to_text_array(p_value jsonb)
+RETURNS text[]
+LANGUAGE sql IMMUTABLE
+AS $$
+    SELECT COALESCE(ARRAY(SELECT jsonb_array_elements_text(p_value)), '{}');
+$$;
+
+-- Converts only columns that are still jsonb, so re-running is a no-op
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+          AND data_type = 'jsonb'
+          AND (table_name, column_name) IN (
+              ('meal_recommendations', 'ingredients'),
+              ('user_preferences', 'allergies')
+          )
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I DROP DEFAULT', col.table_name, col.column_name);
+        EXECUTE format(
+            'ALTER TABLE %I ALTER COLUMN %I TYPE text[] USING jsonb_to_text_array(%I)',
+            col.table_name, col.column_name, col.column_name
+        );
+        EXECUTE format($f$ALTER TABLE %I ALTER COLUMN %I SET DEFAULT '{}'$f$, col.table_name, col.column_name);
+    END LOOP;
+END;
+$$;
+
+-- Indexes for hot read paths
+-- Meals containing a given ingredient / pantry item
+CREATE INDEX IF NOT EXISTS idx_meal_recommendations_ingredients_gin
+    ON meal_recommendations USING GIN (ingredients);
+
+-- Chat history: session-scoped, newest first (replaces the global timestamp index)
+DROP INDEX IF EXISTS idx_chat_messages_timestamp;
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_ts
+    ON chat_messages (chat_session_id, timestamp DESC) INCLUDE (text, type);
+
+-- Active session lookup and session list
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_active
+    ON chat_sessions (user_id) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_created
+    ON chat_sessions (user_id, created_at DESC);
+
+-- Meal history screen
+CREATE INDEX IF NOT EXISTS idx_meal_recommendations_user_created
+    ON meal_recommendations (user_id, created_at DESC) INCLUDE (name, image_url, calories);
+
+-- Pantry list screen
+CREATE INDEX IF NOT EXISTS idx_pantry_items_user_confirmed
+    ON pantry_items (user_id, confirmed) INCLUDE (name, category);
+
+-- Everything a chat turn needs in one round trip: the session (given id, else the
+-- active one), its last N messages (oldest first) and the user's preferences
+CREATE OR REPLACE FUNCTION get_chat_context(
+    p_user_id text,
+    p_session_id uuid DEFAULT NULL,
+    p_history_limit int DEFAULT 5
+)
+RETURNS jsonb
+LANGUAGE sql STABLE
+AS $$
+    WITH s AS (
+        SELECT *
+        FROM chat_sessions
+        WHERE user_id = p_user_id
+          AND CASE WHEN p_session_id IS NULL THEN is_active ELSE id = p_session_id END
+        LIMIT 1
+    )
+    SELECT jsonb_build_object(
+        'session', (SELECT to_jsonb(s) FROM s),
+        'messages', COALESCE((
+            SELECT jsonb_agg(to_jsonb(m) ORDER BY m.timestamp)
+            FROM (
+                SELECT cm.*
+                FROM chat_messages cm
+                JOIN s ON cm.chat_session_id = s.id
+                ORDER BY cm.timestamp DESC
+                LIMIT p_history_limit
+            ) m
+        ), '[]'::jsonb),
+        'preferences', (
+            SELECT to_jsonb(p) FROM user_preferences p WHERE p.user_id = p_user_id LIMIT 1
+        )
+    );
+$$;
+
+-- Persist a full chat turn (user + assistant message) in one round trip / transaction.
+-- clock_timestamp() keeps the two rows strictly ordered within the transaction.
+CREATE OR REPLACE FUNCTION create_chat_turn(p_session_id uuid, p_user_text text, p_assistant_text text)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_user chat_messages;
+    v_assistant chat_messages;
+BEGIN
+    INSERT INTO chat_messages (chat_session_id, text, type, timestamp)
+    VALUES (p_session_id, p_user_text, 'user', clock_timestamp())
+    RETURNING * INTO v_user;
+    
+    INSERT INTO chat_messages (chat_session_id, text, type, timestamp)
+    VALUES (p_session_id, p_assistant_text, 'assistant', clock_timestamp())
+    RETURNING * INTO v_assistant;
+    
+    RETURN jsonb_build_object(
+        'user_message', to_jsonb(v_user),
+        'assistant_message', to_jsonb(v_assistant)
+    );
+END;
+$$;
+"""
@@ -2,19 +2,36 @@
 Database session management
 Uses Supabase for database operations
 """
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from functools import lru_cache
+import httpx
 import logging
 
 from macronome.settings import BackendConfig
 
 logger = logging.getLogger(__name__)
 
+# One HTTP connection pool shared by the anon and service-role clients (same host).
+# Auth headers are sent per request by each client, so sharing the transport is safe.
+_http_client = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    timeout=httpx.Timeout(120.0),
+    limits=httpx.Limits(max_connections=64),
+)
+
 
 @lru_cache()
+def _create_client(url: str, key: str) -> Client:
+    """Create a Supabase client for (url, key) on the shared connection pool (cached)"""
+    client = create_client(url, key, options=ClientOptions(httpx_client=_http_client))
+    logger.info("✅ Supabase client initialized")
+    return client
+
+
 def get_supabase_client(use_service_key: bool = False) -> Client:
     """
-    Get Supabase client (cached singleton)
+    Get Supabase client (cached singleton per key)
     
     Args:
         use_service_key: If True, use service role key (admin access)
@@ -31,10 +48,7 @@ def get_supabase_client(use_service_key: bool = False) -> Client:
     if use_service_key and not key:
         raise ValueError("SUPABASE_SERVICE_KEY must be set for admin operations")
     
-    client = create_client(BackendConfig.SUPABASE_URL, key)
-    logger.info(f"✅ Supabase client initialized ({'service role' if use_service_key else 'anon'})")
-    
-    return client
+    return _create_client(BackendConfig.SUPABASE_URL, key)
 
 
 def get_db() -> Client:
@@ -2,17 +2,38 @@
 Chat Service
 Wraps ChatWorkflow for backend use with streaming support
 """
+import asyncio
+import json
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable
 
 from macronome.backend.database.session import get_db
 from macronome.backend.database.chat_helpers import get_chat_messages
+from macronome.ai.core.task import TaskContext
 from macronome.ai.workflows.chat_workflow import ChatWorkflow
-from macronome.ai.schemas.chat_schema import ChatRequest, ChatAction
+from macronome.ai.workflows.chat_workflow_nodes.response_generator import RESPONSE_STREAM_KEY
+from macronome.ai.schemas.chat_schema import ChatRequest, ChatAction, ChatResponse
 
 logger = logging.getLogger(__name__)
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+@lru_cache(maxsize=1)
+def _get_workflow() -> ChatWorkflow:
+    """
+    Get the shared ChatWorkflow (cached singleton)
+    
+    The workflow holds no per-run state, so one validated instance is
+    reused by every ChatService instead of rebuilding it per request.
+    """
+    return ChatWorkflow()
+
+
 class ChatService:
     """
     Service wrapper for ChatWorkflow
@@ -22,39 +43,24 @@ class ChatService:
     """
     
     def __init__(self):
-        """Initialize the service with workflow instance"""
-        self._workflow = ChatWorkflow()
+        """Initialize the service with the shared workflow instance"""
+        self._workflow = _get_workflow()
     
-    async def process_message(
+    async def _build_request(
         self,
         message: str,
         chat_session_id: str,
         user_id: str,
         user_preferences: Dict[str, Any],
-        pantry_items: list = None
-    ) -> Dict[str, Any]:
-        """
-        Process chat message and return response with action data.
-        
-        Args:
-            message: User's chat message
-            chat_session_id: Active chat session ID
-            user_id: Clerk user ID
-            user_preferences: Current user preferences from DB
-            pantry_items: User's pantry items (for meal recommendation)
-        
-        Returns:
-            Dict with:
-            {
-                "response": str,
-                "action": ChatAction,
-                "task_id": str (if START_RECOMMENDATION),
-                "updated_constraints": FilterConstraints (if ADD_CONSTRAINT)
-            }
-        """
-        # Load chat history from DB (last 5 messages)
-        db = get_db()
-        messages = get_chat_messages(db, chat_session_id, limit=5)
+        recent_messages: Optional[List[Dict[str, Any]]] = None,
+        action: Optional[ChatAction] = None,
+    ) -> ChatRequest:
+        """Build the workflow request, loading recent history unless it was preloaded"""
+        messages = recent_messages
+        if messages is None:
+            # Load chat history from DB (last 5 messages)
+            db = get_db()
+            messages = await asyncio.to_thread(get_chat_messages, db, chat_session_id, 5)
         
         # Convert to format: [{'role': 'user'/'assistant', 'content': '...'}]
         chat_history = [
@@ -66,20 +72,17 @@ class ChatService:
         ]
         
         # Prepare request with user preferences included
-        request = ChatRequest(
+        return ChatRequest(
             message=message,
             chat_session_id=chat_session_id,
             user_id=user_id,
             chat_history=chat_history,
-            user_preferences=user_preferences
+            user_preferences=user_preferences,
+            prior_action=action,
         )
-        
-        logger.info(f"💬 Processing chat message for user {user_id}: '{message[:50]}...'")
-        
-        # Run workflow - convert Pydantic model to dict for workflow
-        request_dict = request.model_dump() if hasattr(request, 'model_dump') else request.model_dump()
-        result_context = await self._workflow.run_async(request_dict)
-        
+    
+    def _build_response(self, result_context: TaskContext) -> Dict[str, Any]:
+        """Extract the response dict from a finished workflow run"""
         # Extract response from ResponseGenerator
         response_output = result_context.nodes.get("ResponseGenerator")
         
@@ -107,7 +110,122 @@ class ChatService:
             if task_id:
                 response_dict["task_id"] = task_id
         
-        logger.info(f"✅ Chat message processed successfully: {action}")
+        return response_dict
+    
+    async def process_message(
+        self,
+        message: str,
+        chat_session_id: str,
+        user_id: str,
+        user_preferences: Dict[str, Any],
+        pantry_items: list = None,
+        recent_messages: Optional[List[Dict[str, Any]]] = None,
+        action: Optional[ChatAction] = None,
+    ) -> Dict[str, Any]:
+        """
+        Process chat message and return response with action data.
+        
+        Args:
+            message: User's chat message
+            chat_session_id: Active chat session ID
+            user_id: Clerk user ID
+            user_preferences: Current user preferences from DB
+            pantry_items: User's pantry items (for meal recommendation)
+            recent_messages: Last chat messages, oldest first (loaded here if None)
+            action: Intent chosen explicitly by the client (skips the LLM router)
+        
+        Returns:
+            Dict with:
+            {
+                "response": str,
+                "action": ChatAction,
+                "task_id": str (if START_RECOMMENDATION),
+                "updated_constraints": FilterConstraints (if ADD_CONSTRAINT)
+            }
+        """
+        request = await self._build_request(
+            message, chat_session_id, user_id, user_preferences, recent_messages, action
+        )
+        
+        logger.info(f"💬 Processing chat message for user {user_id}: '{message[:50]}...'")
+        
+        # Run workflow - pass the validated request directly (no dump/re-validate round trip)
+        result_context = await self._workflow.run_async(request)
+        response_dict = self._build_response(result_context)
+        
+        logger.info(f"✅ Chat message processed successfully: {response_dict['action']}")
         
         return response_dict
-
+    
+    async def stream_message(
+        self,
+        message: str,
+        chat_session_id: str,
+        user_id: str,
+        user_preferences: Dict[str, Any],
+        recent_messages: Optional[List[Dict[str, Any]]] = None,
+        action: Optional[ChatAction] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        on_abort: Optional[Callable[[], None]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Process chat message, yielding Server-Sent Events as the response is generated.
+        
+        Events:
+            start: {"action", "task_id"} - sent before the LLM starts writing
+            delta: {"text"} - next chunk of the response text
+            done: ChatResponse - final response (after on_complete has run)
+            error: {"detail"} - processing failed
+        
+        Args:
+            message: User's chat message
+            chat_session_id: Active chat session ID
+            user_id: Clerk user ID
+            user_preferences: Current user preferences from DB
+            recent_messages: Last chat messages, oldest first (loaded here if None)
+            action: Intent chosen explicitly by the client (skips the LLM router)
+            on_complete: Awaited with the final response dict before the done event
+                (e.g. to persist the chat turn)
+            on_abort: Called (not awaited) if the stream ends before on_complete
+                finished - failure or client disconnect (e.g. to keep the user message)
+        """
+        run: Optional[asyncio.Task] = None
+        completed = False
+        try:
+            request = await self._build_request(
+                message, chat_session_id, user_id, user_preferences, recent_messages, action
+            )
+            
+            logger.info(f"💬 Streaming chat message for user {user_id}: '{message[:50]}...'")
+            
+            stream: asyncio.Queue = asyncio.Queue()
+            run = asyncio.create_task(
+                self._workflow.run_async(request, metadata={RESPONSE_STREAM_KEY: stream})
+            )
+            # End of stream marker, however the workflow finishes
+            run.add_done_callback(lambda _: stream.put_nowait(None))
+            
+            while (item := await stream.get()) is not None:
+                event, data = item
+                yield _sse_event(event, data)
+            
+            response_dict = self._build_response(await run)
+            if on_complete:
+                await on_complete(response_dict)
+            completed = True
+            
+            done = ChatResponse(chat_session_id=chat_session_id, **response_dict)
+            yield _sse_event("done", done.model_dump(mode="json"))
+            
+            logger.info(f"✅ Chat message streamed successfully: {response_dict['action']}")
+        
+        except Exception as e:
+            logger.error(f"❌ Failed to stream chat message for user {user_id}: {e}")
+            yield _sse_event("error", {"detail": f"Failed to process message: {str(e)}"})
+        
+        finally:
+            # Client went away mid-stream - don't keep generating
+            if run and not run.done():
+                run.cancel()
+            if not completed and on_abort:
+                on_abort()
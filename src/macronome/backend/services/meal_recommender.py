@@ -4,13 +4,10 @@ Wraps MealRecommendationWorkflow for backend use via Celery
 """
 import logging
 from typing import Dict, Any, List
+from celery import states
 from celery.result import AsyncResult
 
 from macronome.backend.worker.tasks import recommend_meal_async
-from macronome.ai.schemas.meal_recommender_constraints_schema import (
-    FilterConstraints,
-    PantryItem as WorkflowPantryItem,
-)
 
 logger = logging.getLogger(__name__)
 
@@ -81,31 +78,34 @@ class MealRecommenderService:
             - result: Task result (if success)
             - error: Error message (if failure)
         """
-        task_result = AsyncResult(task_id)
-        
-        logger.info(f"🔍 Task {task_id} state: {task_result.state}, ready: {task_result.ready()}")
-        
-        if task_result.ready():
-            # Task completed
-            if task_result.successful():
-                logger.info(f"✅ Task {task_id} succeeded, result type: {type(task_result.result)}")
-                return {
-                    "status": "success",
-                    "result": task_result.result
-                }
-            else:
-                logger.warning(f"❌ Task {task_id} failed: {task_result.info}")
-                return {
-                    "status": "failure",
-                    "error": str(task_result.info)
-                }
-        else:
-            # Task still processing
-            logger.info(f"⏳ Task {task_id} still processing, state: {task_result.state}")
+        # One result-backend read per poll - AsyncResult's state/ready()/result
+        # properties each re-fetch the meta until the task has finished
+        meta = AsyncResult(task_id).backend.get_task_meta(task_id)
+        state = meta["status"]
+        
+        logger.info(f"🔍 Task {task_id} state: {state}")
+        
+        if state == states.SUCCESS:
+            result = meta.get("result")
+            logger.info(f"✅ Task {task_id} succeeded, result type: {type(result)}")
+            return {
+                "status": "success",
+                "result": result
+            }
+        
+        if state in states.READY_STATES:
+            # FAILURE / REVOKED - result holds the exception
+            logger.warning(f"❌ Task {task_id} failed: {meta.get('result')}")
             return {
-                "status": task_result.state.lower(),  # "pending" or "started"
-                "result": None
+                "status": "failure",
+                "error": str(meta.get("result"))
             }
+        
+        # Task still processing
+        return {
+            "status": state.lower(),  # "pending" or "started"
+            "result": None
+        }
     
     def _prepare_request(
         self,
@@ -126,32 +126,33 @@ class MealRecommenderService:
         Returns:
             Request dict for workflow
         """
-        # Convert constraints dict to FilterConstraints schema
-        filter_constraints = FilterConstraints(
-            calories=constraints.get("calories"),
-            macros=constraints.get("macros"),
-            diet=constraints.get("diet"),
-            allergies=constraints.get("excludedIngredients", constraints.get("allergies", [])),
-            prep_time=constraints.get("prepTime", constraints.get("prep_time")),
-            meal_type=constraints.get("mealType", constraints.get("meal_type")),
-            custom_constraints=constraints.get("custom_constraints", {})
-        )
+        # Normalize key names/defaults only - the workflow validates the request
+        # once on entry (MealRecommendationRequest), so no models are built here
+        filter_constraints = {
+            "calories": constraints.get("calories"),
+            "macros": constraints.get("macros"),
+            "diet": constraints.get("diet"),
+            "allergies": constraints.get("excludedIngredients", constraints.get("allergies", [])),
+            "prep_time": constraints.get("prepTime", constraints.get("prep_time")),
+            "meal_type": constraints.get("mealType", constraints.get("meal_type")),
+            "custom_constraints": constraints.get("custom_constraints", {}),
+        }
         
-        # Convert pantry items to workflow schema
+        # Keep only the workflow's pantry fields (drops extra DB columns)
         workflow_pantry_items = [
-            WorkflowPantryItem(
-                name=item["name"],
-                category=item.get("category"),
-                confirmed=item.get("confirmed", True)
-            )
+            {
+                "name": item["name"],
+                "category": item.get("category"),
+                "confirmed": item.get("confirmed", True),
+            }
             for item in pantry_items
         ]
         
         # Create workflow request
         request_data = {
             "user_query": user_query,
-            "constraints": filter_constraints.model_dump(),
-            "pantry_items": [item.model_dump() for item in workflow_pantry_items],
+            "constraints": filter_constraints,
+            "pantry_items": workflow_pantry_items,
             "chat_history": chat_history
         }
         
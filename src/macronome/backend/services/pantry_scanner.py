@@ -2,8 +2,9 @@
 Pantry Scanner Service
 Wraps PantryScannerWorkflow for backend use
 """
+import asyncio
 import logging
-from typing import List, Dict, Any, Union
+from typing import BinaryIO, List, Dict, Any, Tuple, Union
 from PIL import Image
 import io
 
@@ -12,6 +13,57 @@ from macronome.ai.schemas.pantry_scanner_schema import ClassifiedPantryItem
 
 logger = logging.getLogger(__name__)
 
+# Detection only needs detector resolution (YOLO letterboxes to 640); items are
+# still cropped from the full-resolution image for classification
+SCAN_DETECTION_SIZE = (640, 640)
+
+
+def decode_image(image_bytes: Union[bytes, BinaryIO]) -> Image.Image:
+    """
+    Decode image bytes into a fully loaded RGB PIL Image.
+    
+    Blocking (JPEG decode + color conversion) - call via asyncio.to_thread
+    from async code.
+    
+    Args:
+        image_bytes: Encoded image (JPEG, PNG, WebP, ...) as bytes or a binary file object
+    
+    Returns:
+        RGB PIL Image
+    
+    Raises:
+        ValueError: If image is invalid
+    """
+    try:
+        source = io.BytesIO(image_bytes) if isinstance(image_bytes, bytes) else image_bytes
+        pil_image = Image.open(source)
+        # Ensure RGB mode (convert() decodes; otherwise force the lazy decode here)
+        if pil_image.mode != "RGB":
+            return pil_image.convert("RGB")
+        pil_image.load()
+        return pil_image
+    except Exception as e:
+        raise ValueError(f"Invalid image data: {e}")
+
+
+def detection_image(image: Image.Image, size: Tuple[int, int] = SCAN_DETECTION_SIZE) -> Image.Image:
+    """
+    Downscale an image for the detector by an integer box-filter factor.
+    
+    The result is no smaller than size in either dimension, so detection sees
+    the same resolution after letterboxing. Blocking - call via asyncio.to_thread
+    from async code.
+    
+    Args:
+        image: Full-resolution RGB image
+        size: Minimum (width, height) to keep
+    
+    Returns:
+        Reduced copy, or the image itself if it is already small
+    """
+    factor = min(image.width // size[0], image.height // size[1])
+    return image.reduce(factor) if factor > 1 else image
+
 
 class PantryScannerService:
     """
@@ -52,11 +104,15 @@ class PantryScannerService:
             Exception: If workflow execution fails
         """
         # Convert bytes to PIL Image if needed
-        pil_image = self._prepare_image(image)
+        pil_image = await self._prepare_image(image)
+        
+        # Detect on a downscaled copy; crops come from the full image
+        detection_input = await asyncio.to_thread(detection_image, pil_image)
         
         # Create workflow request
         request_data = {
             "image": pil_image,
+            "detection_image": detection_input,
             "conf_threshold": conf_threshold,
             "crop_padding": crop_padding
         }
@@ -86,9 +142,9 @@ class PantryScannerService:
             logger.error(f"❌ Pantry scan failed: {e}")
             raise
     
-    def _prepare_image(self, image: Union[bytes, Image.Image]) -> Image.Image:
+    async def _prepare_image(self, image: Union[bytes, Image.Image]) -> Image.Image:
         """
-        Convert image bytes to PIL Image
+        Convert image bytes to PIL Image (decoded in a worker thread)
         
         Args:
             image: Image as bytes or PIL Image
@@ -103,14 +159,7 @@ class PantryScannerService:
             return image
         
         if isinstance(image, bytes):
-            try:
-                pil_image = Image.open(io.BytesIO(image))
-                # Ensure RGB mode
-                if pil_image.mode != "RGB":
-                    pil_image = pil_image.convert("RGB")
-                return pil_image
-            except Exception as e:
-                raise ValueError(f"Invalid image data: {e}")
+            return await asyncio.to_thread(decode_image, image)
         
         raise ValueError(f"Unsupported image type: {type(image)}")
     
@@ -124,25 +173,16 @@ class PantryScannerService:
         Returns:
             List of formatted item dicts
         """
-        formatted = []
-        
-        for item in items:
-            # Extract category from classification (e.g., "apple" -> "fruit")
-            # For now, use classification as-is; could add category mapping later
-            classification = item.classification
-            
-            formatted_item = {
-                "name": classification,
+        # Extract category from classification (e.g., "apple" -> "fruit")
+        # For now, use classification as-is; could add category mapping later
+        # bounding_box.model_dump() serializes the box in one pydantic-core call
+        return [
+            {
+                "name": item.classification,
                 "confidence": item.confidence,
-                "bounding_box": {
-                    "x": item.item.bounding_box.x,
-                    "y": item.item.bounding_box.y,
-                    "width": item.item.bounding_box.width,
-                    "height": item.item.bounding_box.height
-                },
+                "bounding_box": item.item.bounding_box.model_dump(),
                 "detected_at": None,  # Will be set when saved to DB
                 "confirmed": False,  # User needs to confirm
             }
-            formatted.append(formatted_item)
-        
-        return formatted
+            for item in items
+        ]
@@ -1,14 +1,18 @@
 """
 Storage module - provides image storage abstraction
 Usage:
-    from macronome.backend.storage import storage
-    url = storage.upload_image(user_id, image_bytes, filename)
+    from macronome.backend.storage import get_storage
+    url = get_storage().upload_image(user_id, image_bytes, filename)
 """
 from macronome.backend.storage.factory import get_storage
 from macronome.backend.storage.interface import StorageInterface
 
-# Initialize storage backend on module load
-storage: StorageInterface = get_storage()
 
-__all__ = ["storage", "StorageInterface"]
+def __getattr__(name: str):
+    """Lazy `storage` attribute (PEP 562) - the backend is created on first access, not at import"""
+    if name == "storage":
+        return get_storage()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+
+__all__ = ["storage", "get_storage", "StorageInterface"]
@@ -2,6 +2,7 @@
 Storage factory - selects storage implementation based on configuration
 """
 import logging
+from functools import lru_cache
 from macronome.settings import BackendConfig
 from macronome.backend.storage.interface import StorageInterface
 from macronome.backend.storage.local import LocalStorage
@@ -10,9 +11,10 @@ from macronome.backend.storage.supabase import SupabaseStorage
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def get_storage() -> StorageInterface:
     """
-    Get storage implementation based on configuration
+    Get storage implementation based on configuration (created once, on first use)
     
     Returns:
         Storage implementation (LocalStorage or SupabaseStorage)
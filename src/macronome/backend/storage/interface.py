@@ -2,7 +2,7 @@
 Storage interface for image uploads
 Defines the protocol that all storage implementations must follow
 """
-from typing import Protocol, Optional
+from typing import BinaryIO, Protocol, Optional, Union
 from supabase import Client
 
 
@@ -12,7 +12,7 @@ class StorageInterface(Protocol):
     def upload_image(
         self,
         user_id: str,
-        image_bytes: bytes,
+        image_bytes: Union[bytes, BinaryIO],
         filename: str,
         supabase_client: Optional[Client] = None
     ) -> str:
@@ -21,7 +21,7 @@ class StorageInterface(Protocol):
         
         Args:
             user_id: Clerk user ID
-            image_bytes: Image file bytes
+            image_bytes: Image file bytes, or a binary file object positioned at the start
             filename: Original filename (will be sanitized)
             supabase_client: Optional Supabase client (for Supabase implementation)
         
@@ -4,30 +4,44 @@ Used for development mode
 """
 import os
 import logging
+import re
+import time
+import shutil
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import BinaryIO, Optional, Union
 from supabase import Client
 
 logger = logging.getLogger(__name__)
 
+# Anything outside [A-Za-z0-9._-] (spaces, unicode, separators) becomes "_"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+# UTC upload timestamp prefix, e.g. 20250101_120000
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
 # Local storage directory for dev
 LOCAL_UPLOADS_DIR = Path("data/uploads")
-LOCAL_UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+
+# Chunk size when streaming file-like uploads to disk
+_COPY_CHUNK_SIZE = 8 * 1024 * 1024
 
 
 class LocalStorage:
     """Local filesystem storage implementation"""
     
+    def __init__(self):
+        """Create the uploads directory (on first use, not at import)"""
+        LOCAL_UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+    
     def upload_image(
         self,
         user_id: str,
-        image_bytes: bytes,
+        image_bytes: Union[bytes, BinaryIO],
         filename: str,
         supabase_client: Optional[Client] = None
     ) -> str:
-        """Upload image to local filesystem"""
-        if not image_bytes:
+        """Upload image to local filesystem (file objects are streamed, not buffered)"""
+        if isinstance(image_bytes, bytes) and not image_bytes:
             raise ValueError("image_bytes cannot be empty")
         
         if not filename:
@@ -35,14 +49,22 @@ class LocalStorage:
         
         # Sanitize filename
         safe_filename = self._sanitize_filename(filename)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime(_TIMESTAMP_FORMAT, time.gmtime())
         file_path = f"{user_id}/{timestamp}_{safe_filename}"
         
         local_path = LOCAL_UPLOADS_DIR / file_path
         local_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(local_path, "wb") as f:
-            f.write(image_bytes)
+            if isinstance(image_bytes, bytes):
+                f.write(image_bytes)
+            else:
+                shutil.copyfileobj(image_bytes, f, length=_COPY_CHUNK_SIZE)
+            written = f.tell()
+        
+        if not written:
+            local_path.unlink()
+            raise ValueError("image_bytes cannot be empty")
         
         logger.info(f"✅ Uploaded image to local storage: {local_path}")
         return str(local_path)
@@ -85,12 +107,7 @@ class LocalStorage:
     @staticmethod
     def _sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe storage"""
-        # Remove path components
-        filename = os.path.basename(filename)
-        # Replace spaces and special chars
-        filename = filename.replace(" ", "_")
-        # Remove any remaining problematic characters
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-"
-        filename = "".join(c if c in safe_chars else "_" for c in filename)
-        return filename
+        # Remove path components, then replace spaces and any other
+        # problematic characters in one C-level pass
+        return _UNSAFE_FILENAME_CHARS.sub("_", os.path.basename(filename))
 
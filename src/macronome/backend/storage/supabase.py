@@ -4,15 +4,31 @@ Used for production mode
 """
 import os
 import logging
-from typing import Optional
-from datetime import datetime
+import re
+import time
+from typing import BinaryIO, Optional, Union
 from urllib.parse import urlparse
 from supabase import Client
 
+from macronome.backend.database.session import get_supabase_client
 from macronome.settings import BackendConfig
 
 logger = logging.getLogger(__name__)
 
+# Anything outside [A-Za-z0-9._-] (spaces, unicode, separators) becomes "_"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+# UTC upload timestamp prefix, e.g. 20250101_120000
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+_PANTRY_IMAGES_BUCKET = BackendConfig.PANTRY_IMAGES_BUCKET
+
+# Leading magic bytes -> content type for the accepted upload formats
+_IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+)
+
 
 class SupabaseStorage:
     """Supabase Storage implementation"""
@@ -20,11 +36,15 @@ class SupabaseStorage:
     def upload_image(
         self,
         user_id: str,
-        image_bytes: bytes,
+        image_bytes: Union[bytes, BinaryIO],
         filename: str,
         supabase_client: Optional[Client] = None
     ) -> str:
         """Upload image to Supabase Storage"""
+        if not isinstance(image_bytes, bytes):
+            # Storage API client takes the whole body
+            image_bytes = image_bytes.read()
+        
         if not image_bytes:
             raise ValueError("image_bytes cannot be empty")
         
@@ -32,26 +52,28 @@ class SupabaseStorage:
             raise ValueError("filename cannot be empty")
         
         if supabase_client is None:
-            from macronome.backend.database.session import get_supabase_client
             supabase_client = get_supabase_client(use_service_key=True)
         
         # Sanitize filename
         safe_filename = self._sanitize_filename(filename)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime(_TIMESTAMP_FORMAT, time.gmtime())
         file_path = f"{user_id}/{timestamp}_{safe_filename}"
         
-        bucket = BackendConfig.PANTRY_IMAGES_BUCKET
+        bucket = _PANTRY_IMAGES_BUCKET
+        
+        # One bucket proxy for both calls (same client, same pooled connection)
+        bucket_api = supabase_client.storage.from_(bucket)
         
         try:
             # Upload file
-            response = supabase_client.storage.from_(bucket).upload(
+            response = bucket_api.upload(
                 path=file_path,
                 file=image_bytes,
-                file_options={"content-type": "image/jpeg", "upsert": "false"}
+                file_options={"content-type": self._detect_content_type(image_bytes), "upsert": "false"}
             )
             
             # Get public URL
-            public_url = supabase_client.storage.from_(bucket).get_public_url(file_path)
+            public_url = bucket_api.get_public_url(file_path)
             
             logger.info(f"✅ Uploaded image to Supabase Storage: {bucket}/{file_path}")
             return public_url
@@ -68,7 +90,6 @@ class SupabaseStorage:
     ) -> str:
         """Get public URL for an image in Supabase Storage"""
         if supabase_client is None:
-            from macronome.backend.database.session import get_supabase_client
             supabase_client = get_supabase_client(use_service_key=False)
         
         try:
@@ -87,7 +108,6 @@ class SupabaseStorage:
     ) -> bool:
         """Delete image from Supabase Storage"""
         if supabase_client is None:
-            from macronome.backend.database.session import get_supabase_client
             supabase_client = get_supabase_client(use_service_key=True)
         
         try:
@@ -105,15 +125,21 @@ class SupabaseStorage:
             logger.error(f"❌ Failed to delete image from Supabase: {e}")
             return False
     
+    @staticmethod
+    def _detect_content_type(image_bytes: bytes) -> str:
+        """Content type from the image's magic bytes (JPEG if unrecognised)"""
+        for signature, content_type in _IMAGE_SIGNATURES:
+            if image_bytes.startswith(signature):
+                return content_type
+        # WebP: RIFF container with a WEBP form type
+        if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+            return "image/webp"
+        return "image/jpeg"
+    
     @staticmethod
     def _sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe storage"""
-        # Remove path components
-        filename = os.path.basename(filename)
-        # Replace spaces and special chars
-        filename = filename.replace(" ", "_")
-        # Remove any remaining problematic characters
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-"
-        filename = "".join(c if c in safe_chars else "_" for c in filename)
-        return filename
+        # Remove path components, then replace spaces and any other
+        # problematic characters in one C-level pass
+        return _UNSAFE_FILENAME_CHARS.sub("_", os.path.basename(filename))
 
@@ -1,6 +1,12 @@
+import socket
+
 from celery import Celery
 from macronome.settings import BackendConfig
 
+# Keepalive probes after 60s idle so dead Redis connections are noticed
+# (TCP_KEEPIDLE is Linux-only; elsewhere the OS default applies)
+_SOCKET_KEEPALIVE_OPTIONS = {socket.TCP_KEEPIDLE: 60} if hasattr(socket, "TCP_KEEPIDLE") else {}
+
 def get_redis_url():
     return BackendConfig.REDIS_URL
 
@@ -20,8 +26,29 @@ def get_celery_config():
         'result_serializer': 'json',
         'enable_utc': True,
         'broker_connection_retry_on_startup': True,
-        # Use solo pool to avoid fork issues with ML libraries
-        'worker_pool': 'solo',  # Single-threaded, no forking
+        # Reuse pooled, kept-alive Redis connections for publishes and result reads
+        # instead of reconnecting in bursts (the API publishes, the worker consumes)
+        'broker_pool_limit': 10,
+        'broker_transport_options': {
+            'max_connections': 20,
+            'socket_keepalive': True,
+            'socket_keepalive_options': _SOCKET_KEEPALIVE_OPTIONS,
+            'health_check_interval': 30,
+            'retry_on_timeout': True,
+            # Longer than the task time_limit (300s) so running tasks aren't redelivered
+            'visibility_timeout': 600,
+        },
+        'redis_max_connections': 20,
+        'redis_socket_keepalive': True,
+        'redis_retry_on_timeout': True,
+        # Thread pool: no forking (avoids fork issues with ML libraries), and the
+        # I/O-bound recommendation tasks (LLM / vector DB calls) run concurrently.
+        # Each task runs its workflow in its own event loop (asyncio.run per thread);
+        # agent nodes are built inside that loop with their own httpx client.
+        'worker_pool': 'threads',
+        'worker_concurrency': BackendConfig.CELERY_WORKER_CONCURRENCY,
+        # Long tasks: don't reserve extra messages behind busy threads
+        'worker_prefetch_multiplier': 1,
     }
 
 celery_app = Celery("tasks")
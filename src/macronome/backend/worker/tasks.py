@@ -4,6 +4,7 @@ Celery Tasks for Macronome
 Async task processing for meal recommendations and other long-running operations.
 """
 import logging
+from functools import lru_cache
 from typing import Dict, Any
 
 from macronome.backend.worker.config import celery_app
@@ -12,6 +13,17 @@ from macronome.ai.workflows.meal_recommender_workflow import MealRecommendationW
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_workflow() -> MealRecommendationWorkflow:
+    """
+    Per-process workflow instance (schema validation and .env loading run once).
+    
+    Safe to share across pool threads: run() keeps all per-run state in its own
+    TaskContext and node instances.
+    """
+    return MealRecommendationWorkflow()
+
+
 @celery_app.task(
     name="recommend_meal_async",
     bind=True,
@@ -55,7 +67,7 @@ def recommend_meal_async(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         logger.info(f"🔄 Starting meal recommendation task {self.request.id}")
         
         # Run meal recommendation workflow (sync version for Celery worker)
-        workflow = MealRecommendationWorkflow()
+        workflow = _get_workflow()
         task_context = workflow.run(request_data)  # workflow.run() takes dict, not Pydantic model
         
         # Extract results - check both success and failure nodes
@@ -63,24 +75,20 @@ def recommend_meal_async(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         failure_output = task_context.nodes.get("FailureAgent")
         
         if explanation_output:
-            # Success path
+            # Success path - plain attribute reads (EnrichedRecipe declares every field)
             recommendation = explanation_output.model_output
+            recipe = recommendation.recipe
             result = {
                 "success": True,
                 "recommendation": {
                     "recipe": {
-                        "id": recommendation.recipe.id,
-                        "name": recommendation.recipe.title,
-                        "ingredients": recommendation.recipe.ingredients,
-                        "directions": recommendation.recipe.directions,
-                        "nutrition": {
-                            "calories": recommendation.recipe.nutrition.calories,
-                            "protein": recommendation.recipe.nutrition.protein,
-                            "carbs": recommendation.recipe.nutrition.carbs,
-                            "fat": recommendation.recipe.nutrition.fat
-                        },
-                        "prep_time": getattr(recommendation.recipe, "prep_time", None),
-                        "semantic_score": getattr(recommendation.recipe, "semantic_score", 0.0)
+                        "id": recipe.id,
+                        "name": recipe.title,
+                        "ingredients": recipe.ingredients,
+                        "directions": recipe.directions,
+                        "nutrition": recipe.nutrition.model_dump(),
+                        "prep_time": recipe.prep_time_estimate,
+                        "semantic_score": recipe.semantic_score
                     },
                     "why_it_fits": recommendation.why_it_fits,
                     "ingredient_swaps": recommendation.ingredient_swaps,
@@ -88,7 +96,7 @@ def recommend_meal_async(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
                     "recipe_instructions": recommendation.recipe_instructions
                 }
             }
-            logger.info(f"✅ Meal recommendation task {self.request.id} succeeded: {recommendation.recipe.title}")
+            logger.info(f"✅ Meal recommendation task {self.request.id} succeeded: {recipe.title}")
             return result
         
         elif failure_output:
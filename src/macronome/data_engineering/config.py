@@ -22,15 +22,25 @@ RECIPES_PARQUET = "recipes.parquet"
 EMBEDDINGS_FAISS = "embeddings.faiss"
 EMBEDDINGS_INDEX = "embeddings.index"
 METADATA_JSON = "metadata.json"
+METADATA_PARQUET = "metadata.parquet"  # FAISS recipes, row i == vector i
 
 # Embedding configuration
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 EMBEDDING_BATCH_SIZE = 512  # Increased for better MPS/GPU utilization
 MAX_TEXT_LENGTH = 512  # Max tokens for embedding (legacy, not used in new format)
+# Local safetensors copy of the embedding model (mmap-loaded, no hub lookups on reruns)
+EMBEDDING_MODEL_DIR = DATA_DIR / "models" / EMBEDDING_MODEL.split("/")[-1]
 
 # Chunking configuration (for streaming large datasets)
 RECIPE_CHUNK_SIZE = 10_000  # Process 10k recipes at a time to avoid OOM
 QDRANT_UPLOAD_BATCH_SIZE = 1000  # Upload 1000 vectors at a time (much faster than 100)
+MAX_PENDING_UPLOADS = 2  # Encoded chunks queued for background Qdrant upload
+QDRANT_INDEXING_THRESHOLD = 20_000  # KB per segment before HNSW indexing (restored after bulk upload)
+
+# FAISS index: HNSW over L2-normalized vectors (inner product == cosine, same as Qdrant)
+FAISS_HNSW_M = 32  # Graph neighbors per vector
+FAISS_HNSW_EF_CONSTRUCTION = 200  # Build-time candidate list (higher = better recall, slower build)
+FAISS_HNSW_EF_SEARCH = 64  # Query-time candidate list
 
 # Embedding format: title + ingredients (no directions)
 # This format matches the descriptive queries generated by the planning agent
@@ -10,18 +10,28 @@ Options:
     --limit LIMIT        Only process first LIMIT recipes (for testing)
     --no-local           Skip local storage (default: save to local)
     --no-s3              Skip S3 upload (default: upload to S3)
+    --force              Re-download even if a recent local parquet exists
 
-Default behavior: Saves to both local and S3
+Default behavior: Saves to both local and S3. A local parquet from a previous
+run (less than RECIPES_MAX_AGE_DAYS old, same --limit) is reused instead of
+downloading and processing the dataset again.
 """
 
 import argparse
+import fnmatch
 import logging
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 import kagglehub
-import pandas as pd
-from datasets import Dataset, load_dataset
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datasets import load_dataset
 
 from macronome.data_engineering.config import (
     RECIPENLG_DATASET,
@@ -36,6 +46,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Recipe data file names, most preferred first (matched anywhere under the dataset dir)
+RECIPE_FILE_PATTERNS = ["full_dataset.csv", "dataset.csv", "recipes.json", "*recipe*.csv"]
+
+# A local parquet younger than this is reused instead of re-downloading
+RECIPES_MAX_AGE_DAYS = 30
+
+# Parquet schema metadata key recording the --limit a file was processed with
+# (0 = full dataset), so a reused local file always matches the requested run
+RECIPE_LIMIT_METADATA_KEY = b"macronome.recipe_limit"
+
+
+def _find_recipe_file(dataset_path: Path) -> Optional[Path]:
+    """
+    Find the recipe data file with one walk of the dataset directory
+    
+    Args:
+        dataset_path: kagglehub dataset directory
+    
+    Returns:
+        Path of the best match by RECIPE_FILE_PATTERNS, or None
+    """
+    best, best_rank = None, len(RECIPE_FILE_PATTERNS)
+    for root, _, files in os.walk(dataset_path):
+        for name in files:
+            # Only patterns that would beat the current best are worth checking
+            for rank, pattern in enumerate(RECIPE_FILE_PATTERNS[:best_rank]):
+                if fnmatch.fnmatch(name, pattern):
+                    best, best_rank = Path(root) / name, rank
+                    break
+            if best_rank == 0:
+                return best
+    return best
+
+
+def load_processed_recipes(limit: int = 0) -> Optional[pa.Table]:
+    """
+    Load recipes from a previous run's local parquet, if it can be reused
+    
+    Args:
+        limit: Requested recipe limit (0 = all); the file's recorded limit must match it
+    
+    Returns:
+        Recipe Arrow table, or None if there is no fresh, matching local copy
+    """
+    recipes_path = RECIPES_PROCESSED_DIR / RECIPES_PARQUET
+    try:
+        age_days = (time.time() - recipes_path.stat().st_mtime) / 86400
+    except FileNotFoundError:
+        return None
+    
+    if age_days > RECIPES_MAX_AGE_DAYS:
+        logger.info(f"Local recipes are {age_days:.0f} days old, re-downloading")
+        return None
+    
+    # Footer-only read - the file must come from a run with the same limit
+    # (a dev 10k-row file must never stand in for the full dataset)
+    schema_metadata = pq.read_schema(recipes_path).metadata or {}
+    file_limit = schema_metadata.get(RECIPE_LIMIT_METADATA_KEY)
+    if file_limit != str(max(limit, 0)).encode():
+        logger.info(
+            f"Local recipes were processed with limit {file_limit.decode() if file_limit else 'unknown'}, "
+            f"re-processing for limit {limit}"
+        )
+        return None
+    
+    recipes = pq.read_table(recipes_path)
+    logger.info(f"Reusing {recipes.num_rows} recipes from {recipes_path} (use --force to re-download)")
+    return recipes
+
 
 def download_recipenlg_dataset():
     """
@@ -54,37 +133,30 @@ def download_recipenlg_dataset():
     logger.info(f"Dataset downloaded to: {dataset_path}")
     
     # Find the main recipe dataset file
-    recipe_files = []
-    
-    # Look for common recipe data file patterns
-    for pattern in ["**/full_dataset.csv", "**/dataset.csv", "**/recipes.json", "**/*recipe*.csv"]:
-        found = list(dataset_path.glob(pattern))
-        if found:
-            recipe_files.extend(found)
-            break
+    recipe_file = _find_recipe_file(dataset_path)
     
-    if not recipe_files:
+    if recipe_file is None:
         # If no common patterns, look for the largest CSV or JSON file
         all_data_files = list(dataset_path.glob("*.csv")) + list(dataset_path.glob("*.json"))
         all_data_files = [f for f in all_data_files if not any(
             x in f.parts for x in ['code', 'model', 'ner', 'vocab', 'test']
         )]
         if all_data_files:
-            recipe_files = [max(all_data_files, key=lambda f: f.stat().st_size)]
+            recipe_file = max(all_data_files, key=lambda f: f.stat().st_size)
     
-    if not recipe_files:
+    if recipe_file is None:
         raise FileNotFoundError(
             f"Could not find recipe dataset in {dataset_path}. "
             f"Found files: {list(dataset_path.glob('*'))}"
         )
     
-    logger.info(f"Found recipe data file: {recipe_files[0]}")
+    logger.info(f"Found recipe data file: {recipe_file}")
     
-    # Load based on file extension
-    data_file = recipe_files[0]
+    # Load based on file extension - straight into an on-disk, memory-mapped
+    # Arrow cache (read in chunks), never a whole-file pandas DataFrame
+    data_file = recipe_file
     if data_file.suffix == '.csv':
-        df = pd.read_csv(data_file)
-        hf_dataset = Dataset.from_pandas(df)
+        hf_dataset = load_dataset("csv", data_files=str(data_file), split="train")
     elif data_file.suffix == '.json':
         hf_dataset = load_dataset("json", data_files=str(data_file), split="train")
     else:
@@ -97,55 +169,75 @@ def download_recipenlg_dataset():
     return hf_dataset
 
 
-def process_recipes(hf_dataset, limit: int = 0):
+# zstd compresses the text-heavy columns (ingredients, directions) far better
+# than the snappy default, with similar read speed
+PARQUET_WRITE_OPTIONS = {"compression": "zstd", "compression_level": 3}
+
+# Rows per parquet row group when streaming to S3 (bounds writer memory)
+S3_ROW_GROUP_SIZE = 50_000
+
+# S3 upload attempts, with 2s, 4s, ... backoff between them
+S3_UPLOAD_ATTEMPTS = 3
+
+# Output column -> (source column in RecipeNLG, fill value if the source lacks it)
+RECIPE_COLUMNS = {
+    "title": ("title", ""),
+    "ingredients": ("ingredients", []),
+    "directions": ("directions", ""),
+    "ner": ("NER", []),
+    "source": ("source", ""),
+    "link": ("link", ""),
+}
+
+
+def process_recipes(hf_dataset, limit: int = 0) -> pa.Table:
     """
-    Convert HuggingFace dataset to list of recipe dictionaries
+    Convert HuggingFace dataset to a recipe Arrow table
+    
+    Works on the dataset's Arrow columns directly (no per-row Python dicts):
+    slices to the limit, adds a unique id column and renames NER -> ner.
     
     Args:
         hf_dataset: HuggingFace dataset
         limit: Maximum number of recipes to process (0 = all)
     
     Returns:
-        List of recipe dictionaries
+        pyarrow Table with columns id, title, ingredients, directions, ner, source, link
     """
     logger.info("Converting recipes to structured format...")
     
-    recipes = []
     dataset_size = len(hf_dataset)
-    process_count = limit if limit > 0 else dataset_size
+    process_count = min(limit, dataset_size) if limit > 0 else dataset_size
     
     logger.info(f"Processing {process_count} of {dataset_size} recipes...")
     
-    for i, recipe in enumerate(hf_dataset):
-        if limit > 0 and i >= limit:
-            break
-        
-        # Convert to dictionary with unique ID
-        processed_recipe = {
-            "id": f"recipe_{i:07d}",
-            "title": recipe.get("title", ""),
-            "ingredients": recipe.get("ingredients", []),
-            "directions": recipe.get("directions", ""),
-            "ner": recipe.get("NER", []),
-            "source": recipe.get("source", ""),
-            "link": recipe.get("link", ""),
-        }
-        
-        recipes.append(processed_recipe)
-        
-        if (i + 1) % 10000 == 0:
-            logger.info(f"Processed {i + 1}/{process_count} recipes...")
+    # Arrow-formatted slice honours any indices mapping on the dataset
+    source = hf_dataset.with_format("arrow")[:process_count]
     
-    logger.info(f"Converted {len(recipes)} recipes successfully")
+    # recipe_0000000, recipe_0000001, ...
+    ids = np.char.add("recipe_", np.char.zfill(np.arange(process_count).astype(str), 7))
+    columns = {"id": pa.array(ids, type=pa.string())}
+    for name, (source_name, default) in RECIPE_COLUMNS.items():
+        if source_name in source.column_names:
+            columns[name] = source[source_name]
+        else:
+            default_type = pa.list_(pa.string()) if isinstance(default, list) else pa.string()
+            columns[name] = pa.repeat(pa.scalar(default, type=default_type), process_count)
+    
+    recipes = pa.table(columns).replace_schema_metadata(
+        {RECIPE_LIMIT_METADATA_KEY: str(max(limit, 0)).encode()}
+    )
+    
+    logger.info(f"Converted {recipes.num_rows} recipes successfully")
     return recipes
 
 
-def save_to_local(recipes):
+def save_to_local(recipes: pa.Table):
     """
     Save recipes to local storage as parquet
     
     Args:
-        recipes: List of recipe dictionaries
+        recipes: Recipe Arrow table
     """
     logger.info("Saving to local storage...")
     
@@ -153,49 +245,61 @@ def save_to_local(recipes):
     RECIPES_PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
     
     # Save recipes as parquet
-    df = pd.DataFrame(recipes)
     recipes_path = RECIPES_PROCESSED_DIR / RECIPES_PARQUET
-    df.to_parquet(recipes_path, index=False)
-    logger.info(f"Saved {len(recipes)} recipes to {recipes_path}")
+    pq.write_table(recipes, recipes_path, **PARQUET_WRITE_OPTIONS)
+    logger.info(f"Saved {recipes.num_rows} recipes to {recipes_path}")
 
 
-def save_to_s3(recipes):
+def save_to_s3(recipes: pa.Table):
     """
     Upload recipes to S3 as parquet
     
+    Streams row groups straight into an S3 multipart upload (parts are sent in
+    the background while later row groups are encoded), so the parquet file is
+    never buffered in memory.
+    
     Args:
-        recipes: List of recipe dictionaries
+        recipes: Recipe Arrow table
     """
     logger.info("Uploading to S3...")
     
     try:
-        import boto3
-        from io import BytesIO
-        
-        # Create DataFrame
-        df = pd.DataFrame(recipes)
-        
-        # Save to bytes buffer
-        buffer = BytesIO()
-        df.to_parquet(buffer, index=False)
-        buffer.seek(0)
+        from pyarrow import fs
         
-        # Configure S3 client
+        # Configure S3 filesystem (falls back to the default AWS credential chain)
         s3_config = {}
         if DataConfig.AWS_ACCESS_KEY_ID:
-            s3_config['aws_access_key_id'] = DataConfig.AWS_ACCESS_KEY_ID
-            s3_config['aws_secret_access_key'] = DataConfig.AWS_SECRET_ACCESS_KEY
+            s3_config['access_key'] = DataConfig.AWS_ACCESS_KEY_ID
+            s3_config['secret_key'] = DataConfig.AWS_SECRET_ACCESS_KEY
         
-        s3_client = boto3.client('s3', region_name=DataConfig.S3_REGION, **s3_config)
+        s3 = fs.S3FileSystem(region=DataConfig.S3_REGION, **s3_config)
         
-        # Upload to S3
+        # Upload to S3 (each retry rewrites the object from the start)
         s3_key = f"{RECIPES_PARQUET}"
-        s3_client.upload_fileobj(buffer, DataConfig.S3_BUCKET, s3_key)
+        for attempt in range(1, S3_UPLOAD_ATTEMPTS + 1):
+            try:
+                pq.write_table(
+                    recipes,
+                    f"{DataConfig.S3_BUCKET}/{s3_key}",
+                    filesystem=s3,
+                    row_group_size=S3_ROW_GROUP_SIZE,
+                    **PARQUET_WRITE_OPTIONS,
+                )
+                break
+            except OSError as e:
+                if attempt == S3_UPLOAD_ATTEMPTS:
+                    raise
+                delay = 2 ** attempt
+                logger.warning(
+                    f"S3 upload failed (attempt {attempt}/{S3_UPLOAD_ATTEMPTS}): {e}. "
+                    f"Retrying in {delay}s..."
+                )
+                time.sleep(delay)
         
-        logger.info(f"Uploaded {len(recipes)} recipes to s3://{DataConfig.S3_BUCKET}/{s3_key}")
+        logger.info(f"Uploaded {recipes.num_rows} recipes to s3://{DataConfig.S3_BUCKET}/{s3_key}")
         
     except ImportError:
-        logger.error("boto3 is not installed. Run: pip install boto3")
+        logger.error("pyarrow was built without S3 support. Run: pip install --upgrade pyarrow")
         raise
     except Exception as e:
         logger.error(f"Failed to upload to S3: {e}")
@@ -221,6 +325,11 @@ def main():
         action="store_true",
         help="Skip S3 upload (default: upload to S3)"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-download and re-process even if a recent local parquet exists"
+    )
     args = parser.parse_args()
     
     # Default to both, unless explicitly disabled
@@ -246,18 +355,29 @@ def main():
         sys.exit(1)
     
     try:
-        # Step 1: Download dataset
-        hf_dataset = download_recipenlg_dataset()
-        
-        # Step 2: Process recipes
-        recipes = process_recipes(hf_dataset, limit=limit)
-        
-        # Step 3: Save to storage
-        if save_local:
-            save_to_local(recipes)
+        # Reuse the local parquet from a previous run when possible
+        recipes = None if args.force else load_processed_recipes(limit)
+        if recipes is not None:
+            save_local = False  # already on disk
+        else:
+            # Step 1: Download dataset
+            hf_dataset = download_recipenlg_dataset()
+            
+            # Step 2: Process recipes
+            recipes = process_recipes(hf_dataset, limit=limit)
         
-        if save_s3:
-            save_to_s3(recipes)
+        # Step 3: Save to storage - the local write and S3 upload are both
+        # I/O bound, so run them side by side on the same table
+        savers = [
+            saver
+            for saver, enabled in ((save_to_local, save_local), (save_to_s3, save_s3))
+            if enabled
+        ]
+        if savers:
+            with ThreadPoolExecutor(max_workers=len(savers)) as executor:
+                futures = [executor.submit(saver, recipes) for saver in savers]
+                for future in futures:
+                    future.result()
         
         logger.info("=" * 60)
         logger.info("Download complete!")
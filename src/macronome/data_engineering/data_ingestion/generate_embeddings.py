@@ -6,6 +6,7 @@ Generates embeddings for recipes and stores in FAISS (local) or Qdrant (cloud).
 Optimizations:
 - Randomly samples 1M recipes from the full dataset (2.23M) for Qdrant free tier
 - Uses Qdrant's built-in INT8 scalar quantization to reduce storage footprint by ~75%
+- Stores the original vectors as float16 on disk (half the size of float32)
 - Uses Metal (MPS) acceleration on Apple Silicon for faster embedding generation
 
 Usage:
@@ -24,21 +25,31 @@ import json
 import logging
 import sys
 import time
-from typing import List, Dict
-
-import boto3
-from io import BytesIO
-import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import fs
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, models
+from qdrant_client.models import models
 import torch
 from sentence_transformers import SentenceTransformer
 
 from macronome.data_engineering.config import (
     EMBEDDING_BATCH_SIZE,
     EMBEDDING_MODEL,
+    EMBEDDING_MODEL_DIR,
     EMBEDDINGS_FAISS,
-    METADATA_JSON,
+    FAISS_HNSW_EF_CONSTRUCTION,
+    FAISS_HNSW_M,
+    MAX_PENDING_UPLOADS,
+    QDRANT_INDEXING_THRESHOLD,
+    METADATA_PARQUET,
     QDRANT_UPLOAD_BATCH_SIZE,
     RECIPE_CHUNK_SIZE,
     RECIPES_PARQUET,
@@ -55,13 +66,49 @@ logger = logging.getLogger(__name__)
 # Max recipes to process (for Qdrant free tier optimization)
 MAX_RECIPES = 1_000_000
 
+# Only columns the embedding text and Qdrant payload need are read from parquet
+EMBED_COLUMNS = ["id", "title", "ingredients"]
+
+# FAISS metadata stores full recipes: the Recipe fields the retrieval node rebuilds
+FAISS_COLUMNS = EMBED_COLUMNS + ["directions", "ner", "source", "link"]
+
+
+def _read_sampled_recipes(parquet_file: pq.ParquetFile, limit: int = 0) -> pa.Table:
+    """
+    Read a seeded random sample of up to MAX_RECIPES rows (FAISS_COLUMNS only)
+    
+    Rows are picked batch by batch while streaming the file (same selection as
+    the Qdrant stream), so the unsampled rows are never held in memory.
+    
+    Args:
+        parquet_file: Open recipes ParquetFile
+        limit: Max recipes to load (0 = all, but respects MAX_RECIPES)
+    
+    Returns:
+        Recipe Arrow table (max 1M randomly sampled rows)
+    """
+    num_rows = parquet_file.metadata.num_rows
+    logger.info(f"Found {num_rows} total recipes")
+    
+    selected = _select_rows(num_rows, limit)
+    chunks = list(_iter_recipe_chunks(parquet_file, selected, columns=FAISS_COLUMNS))
+    if not chunks:
+        return parquet_file.schema_arrow.empty_table().select(FAISS_COLUMNS)
+    
+    recipes = pa.concat_tables(chunks)
+    logger.info(f"Loaded {recipes.num_rows} recipes")
+    return recipes
+
 
-def load_recipes_from_local() -> List[Dict]:
+def load_recipes_from_local(limit: int = 0) -> pa.Table:
     """
     Load recipes from local parquet file, randomly sampling if needed
     
+    Args:
+        limit: Max recipes to load (0 = all, but respects MAX_RECIPES)
+    
     Returns:
-        List of recipe dictionaries (max 1M randomly sampled)
+        Recipe Arrow table (max 1M randomly sampled)
     """
     logger.info("Loading recipes from local storage...")
     
@@ -72,66 +119,87 @@ def load_recipes_from_local() -> List[Dict]:
             f"Run download_recipes.py first."
         )
     
-    df = pd.read_parquet(recipes_path)
-    logger.info(f"Loaded {len(df)} total recipes from {recipes_path}")
-    
-    # Randomly sample if dataset is larger than MAX_RECIPES
-    if len(df) > MAX_RECIPES:
-        logger.info(f"Dataset has {len(df)} recipes. Randomly sampling {MAX_RECIPES} recipes...")
-        df = df.sample(n=MAX_RECIPES, random_state=42)
-        logger.info(f"Sampled {len(df)} recipes")
-    
-    recipes = df.to_dict('records')
-    return recipes
+    # Kept columnar (no dict per recipe)
+    logger.info(f"Reading recipes from {recipes_path}")
+    return _read_sampled_recipes(_open_recipes_parquet(recipes_path), limit)
 
 
-def load_recipes_from_s3() -> List[Dict]:
+def load_recipes_from_s3(limit: int = 0) -> pa.Table:
     """
-    Download recipes from S3 and load, randomly sampling if needed
+    Load recipes from S3, randomly sampling if needed
+    
+    Args:
+        limit: Max recipes to load (0 = all, but respects MAX_RECIPES)
     
     Returns:
-        List of recipe dictionaries (max 1M randomly sampled)
+        Recipe Arrow table (max 1M randomly sampled)
     """
     logger.info("Loading recipes from S3...")
     
     try:
-        
-        # Configure S3 client
-        s3_config = {}
-        if DataConfig.AWS_ACCESS_KEY_ID:
-            s3_config['aws_access_key_id'] = DataConfig.AWS_ACCESS_KEY_ID
-            s3_config['aws_secret_access_key'] = DataConfig.AWS_SECRET_ACCESS_KEY
-        
-        s3_client = boto3.client('s3', region_name=DataConfig.S3_REGION, **s3_config)
-        
-        # Download from S3
         s3_key = f"{DataConfig.S3_RECIPES_PREFIX}{RECIPES_PARQUET}"
-        buffer = BytesIO()
-        s3_client.download_fileobj(DataConfig.S3_BUCKET, s3_key, buffer)
-        buffer.seek(0)
+        logger.info(f"Reading recipes from s3://{DataConfig.S3_BUCKET}/{s3_key}")
+        return _read_sampled_recipes(_open_recipes_parquet(RECIPES_PARQUET, is_s3=True), limit)
         
-        # Load parquet from buffer
-        df = pd.read_parquet(buffer)
-        logger.info(f"Loaded {len(df)} total recipes from s3://{DataConfig.S3_BUCKET}/{s3_key}")
-        
-        # Randomly sample if dataset is larger than MAX_RECIPES
-        if len(df) > MAX_RECIPES:
-            logger.info(f"Dataset has {len(df)} recipes. Randomly sampling {MAX_RECIPES} recipes...")
-            df = df.sample(n=MAX_RECIPES, random_state=42)
-            logger.info(f"Sampled {len(df)} recipes")
-        
-        recipes = df.to_dict('records')
-        return recipes
-        
-    except ImportError:
-        logger.error("boto3 is not installed. Run: pip install boto3")
-        raise
     except Exception as e:
         logger.error(f"Failed to load from S3: {e}")
         raise
 
 
-def generate_embeddings(recipes: List[Dict], model=None, id_offset=0, show_progress=True):
+def _recipe_texts(recipes: pa.Table) -> List[str]:
+    """
+    Build the "title: ingredients" embedding texts column-wise
+    
+    Arrow compute kernels join each ingredient list and concatenate with the
+    title in native code - no per-recipe Python loop. String ingredient columns
+    (JSON-encoded lists from the CSV) are used as-is, like str() before.
+    
+    Args:
+        recipes: Recipe table with title and ingredients columns
+    
+    Returns:
+        List of texts, one per recipe
+    """
+    ingredients = recipes["ingredients"]
+    if pa.types.is_list(ingredients.type) or pa.types.is_large_list(ingredients.type):
+        ingredients = pc.binary_join(ingredients, " ")
+    else:
+        ingredients = pc.cast(ingredients, pa.string())
+    
+    titles = pc.cast(recipes["title"], pa.string())
+    texts = pc.binary_join_element_wise(
+        pc.fill_null(titles, ""), pc.fill_null(ingredients, ""), ": "
+    )
+    return texts.to_pylist()
+
+
+def _load_sentence_transformer(device: str) -> SentenceTransformer:
+    """
+    Load the embedding model, preferring the local safetensors copy
+    
+    The first run downloads from the HuggingFace hub and saves the model to
+    EMBEDDING_MODEL_DIR; later runs load from there without hub requests.
+    
+    Args:
+        device: Torch device to load the model on
+    
+    Returns:
+        SentenceTransformer model
+    """
+    if EMBEDDING_MODEL_DIR.exists():
+        logger.info(f"Loading embedding model from {EMBEDDING_MODEL_DIR}")
+        return SentenceTransformer(str(EMBEDDING_MODEL_DIR), device=device)
+    
+    logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
+    model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+    model.save(str(EMBEDDING_MODEL_DIR), safe_serialization=True)
+    logger.info(f"Saved embedding model to {EMBEDDING_MODEL_DIR}")
+    return model
+
+
+def generate_embeddings(
+    recipes: pa.Table, model=None, id_offset=0, show_progress=True
+):
     """
     Generate embeddings for recipes using sentence-transformers
     
@@ -141,7 +209,7 @@ def generate_embeddings(recipes: List[Dict], model=None, id_offset=0, show_progr
     Uses Metal (MPS) acceleration on Apple Silicon Macs if available.
     
     Args:
-        recipes: List of recipe dictionaries
+        recipes: Recipe Arrow table (full or a streamed chunk)
         model: Pre-loaded SentenceTransformer model (optional, for reuse across chunks)
         id_offset: Offset for metadata indexing (for chunked processing)
         show_progress: Show progress bar
@@ -165,8 +233,25 @@ def generate_embeddings(recipes: List[Dict], model=None, id_offset=0, show_progr
             logger.info("Using CPU for embedding generation")
         
         # Load embedding model on selected device
-        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
-        model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+        model = _load_sentence_transformer(device)
+        
+        # FP16 weights/activations on GPU: half the memory traffic and tensor-core
+        # matmuls (FP16 rather than BF16 so older macOS MPS builds work too)
+        if device != "cpu":
+            model.half()
+            logger.info("Running embedding model in FP16")
+        
+        # Fused kernels for the transformer forward; encode() keeps its length-sorted
+        # batching, and dynamic shapes avoid a recompile per padded sequence length
+        if device == "cuda" and DataConfig.EMBEDDING_TORCH_COMPILE:
+            eager_model = model[0].auto_model
+            try:
+                model[0].auto_model = torch.compile(eager_model, dynamic=True)
+                model.encode(["warm-up"], convert_to_numpy=True)  # Compilation happens on first call
+                logger.info("Compiled embedding transformer with torch.compile")
+            except Exception as e:
+                model[0].auto_model = eager_model
+                logger.warning(f"torch.compile failed, using eager embedding model: {e}")
         
         # Limit MPS memory usage to prevent system slowdown
         if device == "mps":
@@ -174,41 +259,43 @@ def generate_embeddings(recipes: List[Dict], model=None, id_offset=0, show_progr
             logger.info("Limited MPS memory to 80% to prevent system slowdown")
     
     # Prepare texts for embedding (title + ingredients only)
-    texts = [
-        f"{recipe['title']}: {' '.join(recipe['ingredients']) if isinstance(recipe['ingredients'], list) else str(recipe['ingredients'])}"
-        for recipe in recipes
-    ]
+    texts = _recipe_texts(recipes)
     
     # Generate embeddings in batches
     logger.info(f"Generating embeddings for {len(texts)} recipes (batch_size={EMBEDDING_BATCH_SIZE})...")
     start_time = time.time()
     
+    # encode() already sorts texts by length before batching (and restores the
+    # original order), so batches are padded to similar lengths
     embeddings = model.encode(
         texts,
         batch_size=EMBEDDING_BATCH_SIZE,
         show_progress_bar=show_progress,
-        convert_to_numpy=True,
+        convert_to_tensor=True,  # Batches stay on device (no per-batch host copy)
     )
+    # FP16 -> float32 on device, then one device-to-host copy for the whole chunk
+    embeddings = embeddings.float().cpu().numpy()
     
     elapsed = time.time() - start_time
     logger.info(f"Generated embeddings with shape {embeddings.shape} in {elapsed:.2f}s ({len(texts)/elapsed:.0f} recipes/sec)")
     
     # Create metadata mapping (recipe_id -> index in vector store)
-    metadata = {
-        recipe["id"]: id_offset + i for i, recipe in enumerate(recipes)
-    }
+    recipe_ids = recipes["id"].to_pylist()
+    metadata = dict(zip(recipe_ids, range(id_offset, id_offset + len(recipe_ids))))
     
     return embeddings, metadata, model
 
 
-def save_to_faiss(embeddings, metadata, recipes):
+def save_to_faiss(embeddings, recipes):
     """
     Build FAISS index and save locally
     
+    Recipes are saved as parquet in index order, so the FAISS vector id is
+    the row number (no separate recipe_id -> index mapping needed).
+    
     Args:
         embeddings: Numpy array of embeddings
-        metadata: Recipe metadata dictionary
-        recipes: List of recipe dictionaries
+        recipes: Recipe Arrow table
     """
     logger.info("Saving to FAISS...")
     
@@ -224,8 +311,13 @@ def save_to_faiss(embeddings, metadata, recipes):
     # Build FAISS index
     logger.info("Building FAISS index...")
     dim = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dim)
-    index.add(embeddings.astype('float32'))
+    # Normalized vectors + inner product == cosine (matches Qdrant's Distance.COSINE);
+    # HNSW avoids a brute-force scan over every vector per query
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    faiss.normalize_L2(embeddings)
+    index = faiss.IndexHNSWFlat(dim, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+    index.add(embeddings)
     logger.info(f"FAISS index built successfully. Total vectors: {index.ntotal}")
     
     # Save FAISS index
@@ -233,15 +325,9 @@ def save_to_faiss(embeddings, metadata, recipes):
     faiss.write_index(index, str(index_path))
     logger.info(f"Saved FAISS index to {index_path}")
     
-    # Save metadata
-    metadata_path = RECIPES_PROCESSED_DIR / METADATA_JSON
-    # Store full recipes in metadata for retrieval
-    metadata_with_recipes = {
-        "recipe_id_to_index": metadata,
-        "recipes": recipes
-    }
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata_with_recipes, f, indent=2)
+    # Save full recipes for retrieval (columnar + zstd instead of multi-GB indented JSON)
+    metadata_path = RECIPES_PROCESSED_DIR / METADATA_PARQUET
+    pq.write_table(recipes, metadata_path, compression="zstd")
     logger.info(f"Saved metadata to {metadata_path}")
 
 
@@ -257,6 +343,7 @@ def init_qdrant_client():
     client = QdrantClient(
         url=DataConfig.QDRANT_URL,
         api_key=DataConfig.QDRANT_API_KEY,
+        prefer_grpc=True,  # Bulk uploads as protobuf over HTTP/2 (smaller and faster than JSON)
     )
     return client
 
@@ -266,6 +353,8 @@ def setup_qdrant_collection(client, vector_dim, clear_existing=True):
     Setup Qdrant collection (create or clear if needed)
     
     Uses Qdrant's built-in INT8 scalar quantization to reduce storage footprint.
+    New collections start with HNSW indexing disabled for the bulk upload;
+    call _enable_qdrant_indexing once all points are in.
     
     Args:
         client: QdrantClient instance
@@ -293,7 +382,9 @@ def setup_qdrant_collection(client, vector_dim, clear_existing=True):
             vectors_config=models.VectorParams(
                 size=vector_dim,
                 distance=models.Distance.COSINE,  # Cosine similarity for semantic search
-                on_disk=True  # Store vectors on disk to save RAM
+                on_disk=True,  # Store vectors on disk to save RAM
+                # Originals (used for rescoring) stored as float16: half the disk/IO of float32
+                datatype=models.Datatype.FLOAT16,
             ),
             quantization_config=models.ScalarQuantization(
                 scalar=models.ScalarQuantizationConfig(
@@ -301,10 +392,26 @@ def setup_qdrant_collection(client, vector_dim, clear_existing=True):
                     always_ram=True,  # Keep quantized vectors in RAM for faster search
                 ),
             ),
+            # No HNSW building while uploading; the index is built once afterwards
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
         )
         logger.info(f"Collection '{collection_name}' created successfully with INT8 quantization")
 
 
+def _enable_qdrant_indexing(client):
+    """
+    Re-enable HNSW indexing after a bulk upload (one full indexing pass)
+    
+    Args:
+        client: QdrantClient instance
+    """
+    client.update_collection(
+        collection_name=DataConfig.QDRANT_COLLECTION_NAME,
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=QDRANT_INDEXING_THRESHOLD),
+    )
+    logger.info("Re-enabled Qdrant indexing (HNSW builds in the background)")
+
+
 def _parse_ingredients(ingredients):
     """
     Parse ingredients, handling both JSON strings and list formats.
@@ -342,51 +449,186 @@ def _parse_ingredients(ingredients):
     return [str(ingredients)]
 
 
-def upload_to_qdrant_chunk(client, embeddings, recipes, id_offset=0):
+def upload_to_qdrant_chunk(client, embeddings, recipes: pa.Table, id_offset=0):
     """
     Upload a chunk of embeddings to Qdrant
     
     Args:
         client: QdrantClient instance
         embeddings: Numpy array of embeddings for this chunk
-        recipes: List of recipe dictionaries for this chunk
+        recipes: Recipe Arrow table for this chunk
         id_offset: Global ID offset for this chunk
     """
+    collection_name = DataConfig.QDRANT_COLLECTION_NAME
+    num_points = recipes.num_rows
+    
+    # Payload columns converted to Python once per chunk
+    payloads = (
+        {
+            "recipe_id": recipe_id,
+            "title": title,
+            "ingredients": _parse_ingredients(recipe_ingredients),  # Parse ingredients (handles JSON strings)
+        }
+        for recipe_id, title, recipe_ingredients in zip(
+            recipes["id"].to_pylist(),
+            recipes["title"].to_pylist(),
+            recipes["ingredients"].to_pylist(),
+        )
+    )
+    
+    # upload_collection batches the numpy rows itself (no PointStruct per vector)
+    client.upload_collection(
+        collection_name=collection_name,
+        vectors=embeddings,
+        payload=payloads,
+        ids=range(id_offset, id_offset + num_points),
+        batch_size=QDRANT_UPLOAD_BATCH_SIZE,  # 1000 is much faster than 100
+        wait=True,  # Chunk is searchable once this returns (like upsert)
+    )
+    
+    logger.info(f"Uploaded chunk: {num_points} vectors (IDs {id_offset} - {id_offset + num_points - 1})")
+
 
+@lru_cache(maxsize=1)
+def _get_s3_filesystem() -> fs.S3FileSystem:
+    """Get the S3 filesystem, created once and reused for every recipes read"""
+    s3_config = {}
+    if DataConfig.AWS_ACCESS_KEY_ID:
+        s3_config['access_key'] = DataConfig.AWS_ACCESS_KEY_ID
+        s3_config['secret_key'] = DataConfig.AWS_SECRET_ACCESS_KEY
     
-    collection_name = DataConfig.QDRANT_COLLECTION_NAME
-    batch_size = QDRANT_UPLOAD_BATCH_SIZE  # 1000 is much faster than 100
+    return fs.S3FileSystem(region=DataConfig.S3_REGION, **s3_config)
+
+
+def _open_recipes_parquet(source_path, is_s3=False) -> pq.ParquetFile:
+    """
+    Open the recipes parquet without reading it
+    
+    S3 files are opened through pyarrow's S3 filesystem, so only the footer and
+    the requested column chunks are fetched (ranged GETs), never the whole object.
+    
+    Args:
+        source_path: Path to parquet file (local; ignored for S3)
+        is_s3: Whether source is S3
+    
+    Returns:
+        pyarrow ParquetFile
+    """
+    if not is_s3:
+        return pq.ParquetFile(source_path)
+    
+    s3 = _get_s3_filesystem()
+    # Use consistent S3 key pattern with prefix (source_path is RECIPES_PARQUET when is_s3=True)
+    s3_key = f"{DataConfig.S3_RECIPES_PREFIX}{RECIPES_PARQUET}"
+    return pq.ParquetFile(s3.open_input_file(f"{DataConfig.S3_BUCKET}/{s3_key}"))
+
+
+def _select_rows(num_rows: int, limit: int = 0):
+    """
+    Pick which parquet rows to embed
+    
+    Randomly samples MAX_RECIPES rows (seeded) when the file is larger; a user
+    limit then takes a random subset of that sample, or the first rows if no
+    sampling was needed (same semantics as sample + head).
+    
+    Args:
+        num_rows: Rows in the parquet file
+        limit: Max recipes to process (0 = all, but respects MAX_RECIPES)
+    
+    Returns:
+        Sorted numpy array of row indices, or None for every row
+    """
+    if num_rows > MAX_RECIPES:
+        logger.info(f"Randomly sampling {MAX_RECIPES} out of {num_rows} recipes...")
+        # choice() without replacement is already in random order, so a prefix is a random subset
+        selected = np.random.default_rng(42).choice(num_rows, MAX_RECIPES, replace=False)
+        if limit > 0:
+            logger.info(f"Applying user limit: {limit} recipes")
+            selected = selected[:limit]
+        return np.sort(selected)
+    
+    if 0 < limit < num_rows:
+        logger.info(f"Applying user limit: {limit} recipes")
+        return np.arange(limit)
+    
+    return None
+
+
+def _iter_recipe_chunks(parquet_file: pq.ParquetFile, selected=None, columns=EMBED_COLUMNS):
+    """
+    Stream recipe chunks of up to RECIPE_CHUNK_SIZE rows from parquet
+    
+    Reads one record batch at a time (given columns only), keeps the selected
+    rows and regroups them into full-size chunks, so memory stays bounded by a
+    couple of chunks regardless of the file size.
     
-    # Upload in batches
-    for i in range(0, len(recipes), batch_size):
-        batch_recipes = recipes[i:i + batch_size]
-        batch_embeddings = embeddings[i:i + batch_size]
+    Args:
+        parquet_file: Open recipes ParquetFile
+        selected: Sorted row indices to keep, or None for every row
+        columns: Columns to read
+    
+    Yields:
+        Recipe Arrow tables with the given columns
+    """
+    pending, pending_rows, row_start = [], 0, 0
+    
+    for batch in parquet_file.iter_batches(batch_size=RECIPE_CHUNK_SIZE, columns=columns):
+        row_end = row_start + batch.num_rows
+        if selected is not None:
+            lo, hi = np.searchsorted(selected, [row_start, row_end])
+            batch = batch.take(pa.array(selected[lo:hi] - row_start))
+        row_start = row_end
         
-        # Build points on-the-fly (don't store full list in memory)
-        points = [
-            PointStruct(
-                id=id_offset + i + j,
-                vector=vector.tolist(),
-                payload={
-                    "recipe_id": recipe["id"],
-                    "title": recipe["title"],
-                    "ingredients": _parse_ingredients(recipe.get("ingredients")),  # Parse ingredients (handles JSON strings)
-                }
-            )
-            for j, (recipe, vector) in enumerate(zip(batch_recipes, batch_embeddings))
-        ]
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= RECIPE_CHUNK_SIZE:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, RECIPE_CHUNK_SIZE)
+            rest = table.slice(RECIPE_CHUNK_SIZE)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
         
-        # Upload batch
-        client.upsert(collection_name=collection_name, points=points)
+        # Past the last selected row - nothing left to read
+        if selected is not None and (len(selected) == 0 or row_start > selected[-1]):
+            break
     
-    logger.info(f"Uploaded chunk: {len(recipes)} vectors (IDs {id_offset} - {id_offset + len(recipes) - 1})")
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def upload_precomputed_to_qdrant(embeddings, recipes: pa.Table, clear_existing=True):
+    """
+    Upload already-generated embeddings to Qdrant (no re-embedding)
+    
+    Used by target 'both', where the FAISS step has embedded every recipe.
+    
+    Args:
+        embeddings: Numpy array of embeddings, one row per recipe
+        recipes: Recipe Arrow table matching the embedding rows
+        clear_existing: Clear Qdrant collection before starting
+    """
+    client = init_qdrant_client()
+    setup_qdrant_collection(client, embeddings.shape[1], clear_existing=clear_existing)
+    
+    for offset in range(0, recipes.num_rows, RECIPE_CHUNK_SIZE):
+        upload_to_qdrant_chunk(
+            client,
+            embeddings[offset:offset + RECIPE_CHUNK_SIZE],
+            recipes.slice(offset, RECIPE_CHUNK_SIZE),
+            id_offset=offset,
+        )
+    
+    _enable_qdrant_indexing(client)
+    
+    collection_info = client.get_collection(DataConfig.QDRANT_COLLECTION_NAME)
+    logger.info(f"Final collection: {collection_info.points_count} points")
 
 
 def process_qdrant_streamed(source_path, is_s3=False, limit=0, clear_existing=True):
     """
     Stream-process recipes in chunks for Qdrant (memory-efficient for large datasets)
     
-    Loads full dataset, randomly samples up to 1M recipes, then processes in chunks.
+    Reads the parquet one record batch at a time, keeping a seeded random
+    sample of up to 1M recipes, and embeds/uploads chunk by chunk.
     
     Args:
         source_path: Path to parquet file (local or S3 key)
@@ -399,39 +641,13 @@ def process_qdrant_streamed(source_path, is_s3=False, limit=0, clear_existing=Tr
     # Initialize Qdrant client
     client = init_qdrant_client()
     
-    # Load full dataset and sample
-    logger.info("Loading full dataset for random sampling...")
-    if is_s3:
-        # Load from S3
-        s3_config = {}
-        if DataConfig.AWS_ACCESS_KEY_ID:
-            s3_config['aws_access_key_id'] = DataConfig.AWS_ACCESS_KEY_ID
-            s3_config['aws_secret_access_key'] = DataConfig.AWS_SECRET_ACCESS_KEY
-        
-        s3_client = boto3.client('s3', region_name=DataConfig.S3_REGION, **s3_config)
-        buffer = BytesIO()
-        # Use consistent S3 key pattern with prefix (source_path is RECIPES_PARQUET when is_s3=True)
-        s3_key = f"{DataConfig.S3_RECIPES_PREFIX}{RECIPES_PARQUET}"
-        s3_client.download_fileobj(DataConfig.S3_BUCKET, s3_key, buffer)
-        buffer.seek(0)
-        df = pd.read_parquet(buffer)
-    else:
-        df = pd.read_parquet(source_path)
-    
-    logger.info(f"Loaded {len(df)} total recipes")
-    
-    # Randomly sample if needed (up to MAX_RECIPES = 1M)
-    if len(df) > MAX_RECIPES:
-        logger.info(f"Randomly sampling {MAX_RECIPES} out of {len(df)} recipes...")
-        df = df.sample(n=MAX_RECIPES, random_state=42)
-        logger.info(f"Sampled {len(df)} recipes")
-    
-    # Apply user limit if specified
-    if limit > 0 and limit < len(df):
-        logger.info(f"Applying user limit: {limit} recipes")
-        df = df.head(limit)
+    # Only the footer is read here
+    parquet_file = _open_recipes_parquet(source_path, is_s3)
+    num_rows = parquet_file.metadata.num_rows
+    logger.info(f"Found {num_rows} total recipes")
     
-    total_recipes = len(df)
+    selected = _select_rows(num_rows, limit)
+    total_recipes = num_rows if selected is None else len(selected)
     logger.info(f"Total recipes to process: {total_recipes}")
     logger.info(f"Chunk size: {RECIPE_CHUNK_SIZE}")
     logger.info(f"Estimated chunks: {(total_recipes + RECIPE_CHUNK_SIZE - 1) // RECIPE_CHUNK_SIZE}")
@@ -443,61 +659,71 @@ def process_qdrant_streamed(source_path, is_s3=False, limit=0, clear_existing=Tr
     vector_dim = None
     start_time = time.time()
     
+    # Uploads run on a single background thread so the next chunk is encoded
+    # while the previous one is sent; at most MAX_PENDING_UPLOADS chunks are
+    # held in memory waiting for upload
+    pending_uploads = deque()
+    
     # Process in chunks
     offset = 0
-    while offset < total_recipes:
-        chunk_size = min(RECIPE_CHUNK_SIZE, total_recipes - offset)
-        chunk_num += 1
-        
-        logger.info("=" * 60)
-        logger.info(f"Processing chunk {chunk_num} (recipes {offset} - {offset + chunk_size - 1})")
-        logger.info("=" * 60)
-        
-        # Get chunk from dataframe
-        df_chunk = df.iloc[offset:offset + chunk_size]
-        recipes_chunk = df_chunk.to_dict('records')
-        
-        logger.info(f"Processing {len(recipes_chunk)} recipes for this chunk")
-        
-        # Generate embeddings for this chunk
-        embeddings_chunk, _, model = generate_embeddings(
-            recipes_chunk, 
-            model=model,  # Reuse model across chunks
-            id_offset=offset, 
-            show_progress=(chunk_num == 1)  # Only show progress on first chunk
-        )
-        
-        # Setup collection on first chunk
-        if chunk_num == 1:
-            if vector_dim is None:
-                vector_dim = embeddings_chunk.shape[1]
-            setup_qdrant_collection(client, vector_dim, clear_existing=clear_existing)
-        
-        # Upload this chunk
-        upload_to_qdrant_chunk(client, embeddings_chunk, recipes_chunk, id_offset=offset)
-        
-        # Store length before deletion
-        chunk_length = len(recipes_chunk)
-        
-        # Free memory immediately after upload (no need to keep embeddings in memory)
-        del embeddings_chunk
-        del recipes_chunk
-        del df_chunk
-        
-        # Clear MPS memory cache to prevent accumulation
-        if torch.backends.mps.is_available():
-            torch.mps.empty_cache()
-        
-        # Force garbage collection to free memory
-        gc.collect()
-        
-        total_processed += chunk_length
-        offset += chunk_size
+    with ThreadPoolExecutor(max_workers=1) as upload_executor:
+        for recipes_chunk in _iter_recipe_chunks(parquet_file, selected):
+            chunk_size = recipes_chunk.num_rows
+            chunk_num += 1
+            
+            logger.info("=" * 60)
+            logger.info(f"Processing chunk {chunk_num} (recipes {offset} - {offset + chunk_size - 1})")
+            logger.info("=" * 60)
+            
+            logger.info(f"Processing {chunk_size} recipes for this chunk")
+            
+            # Generate embeddings for this chunk
+            embeddings_chunk, _, model = generate_embeddings(
+                recipes_chunk, 
+                model=model,  # Reuse model across chunks
+                id_offset=offset, 
+                show_progress=(chunk_num == 1)  # Only show progress on first chunk
+            )
+            
+            # Setup collection on first chunk
+            if chunk_num == 1:
+                if vector_dim is None:
+                    vector_dim = embeddings_chunk.shape[1]
+                setup_qdrant_collection(client, vector_dim, clear_existing=clear_existing)
+            
+            # Wait for the oldest upload before queueing another (re-raises upload errors)
+            if len(pending_uploads) >= MAX_PENDING_UPLOADS:
+                pending_uploads.popleft().result()
+            
+            # Upload this chunk in the background
+            pending_uploads.append(upload_executor.submit(
+                upload_to_qdrant_chunk, client, embeddings_chunk, recipes_chunk, id_offset=offset
+            ))
+            
+            # Drop local references; the upload task keeps the chunk alive until sent
+            del embeddings_chunk
+            del recipes_chunk
+            
+            # Clear MPS memory cache to prevent accumulation
+            if torch.backends.mps.is_available():
+                torch.mps.empty_cache()
+            
+            # Force garbage collection to free memory
+            gc.collect()
+            
+            total_processed += chunk_size
+            offset += chunk_size
+            
+            # Log progress
+            elapsed = time.time() - start_time
+            recipes_per_sec = total_processed / elapsed
+            logger.info(f"Progress: {total_processed}/{total_recipes} recipes embedded ({100*total_processed/total_recipes:.1f}%) in {elapsed:.1f}s ({recipes_per_sec:.0f} recipes/sec)")
         
-        # Log progress
-        elapsed = time.time() - start_time
-        recipes_per_sec = total_processed / elapsed
-        logger.info(f"Progress: {total_processed}/{total_recipes} recipes ({100*total_processed/total_recipes:.1f}%) in {elapsed:.1f}s ({recipes_per_sec:.0f} recipes/sec)")
+        # Wait for the remaining uploads before verifying
+        while pending_uploads:
+            pending_uploads.popleft().result()
+    
+    _enable_qdrant_indexing(client)
     
     # Final verification
     collection_info = client.get_collection(DataConfig.QDRANT_COLLECTION_NAME)
@@ -575,34 +801,26 @@ def main():
             # FAISS needs all data in memory (old approach)
             logger.info("Loading all recipes into memory (required for FAISS)...")
             if args.source == "local":
-                recipes = load_recipes_from_local()
+                recipes = load_recipes_from_local(args.limit)
             else:
-                recipes = load_recipes_from_s3()
-            
-            if args.limit > 0:
-                recipes = recipes[:args.limit]
-                logger.info(f"Limited to {len(recipes)} recipes")
+                recipes = load_recipes_from_s3(args.limit)
             
-            embeddings, metadata, model = generate_embeddings(recipes)
-            save_to_faiss(embeddings, metadata, recipes)
+            embeddings, _, model = generate_embeddings(recipes)
+            save_to_faiss(embeddings, recipes)
         else:  # both
             # For both, use old approach (needs all in memory for FAISS anyway)
             logger.warning("Target 'both' requires loading all recipes into memory (for FAISS)")
             if args.source == "local":
-                recipes = load_recipes_from_local()
+                recipes = load_recipes_from_local(args.limit)
             else:
-                recipes = load_recipes_from_s3()
+                recipes = load_recipes_from_s3(args.limit)
             
-            if args.limit > 0:
-                recipes = recipes[:args.limit]
-                logger.info(f"Limited to {len(recipes)} recipes")
+            embeddings, _, model = generate_embeddings(recipes)
+            save_to_faiss(embeddings, recipes)
             
-            embeddings, metadata, model = generate_embeddings(recipes)
-            save_to_faiss(embeddings, metadata, recipes)
-            
-            # For Qdrant, use streaming
+            # Reuse the FAISS embeddings for Qdrant instead of re-embedding
             logger.info("\nNow uploading to Qdrant...")
-            process_qdrant_streamed(source_path, is_s3, args.limit, clear_existing)
+            upload_precomputed_to_qdrant(embeddings, recipes, clear_existing)
         
         logger.info("=" * 60)
         logger.info("Embedding generation complete!")
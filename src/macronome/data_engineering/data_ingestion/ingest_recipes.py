@@ -31,6 +31,8 @@ from macronome.data_engineering.config import (
     EMBEDDING_BATCH_SIZE,
     EMBEDDING_MODEL,
     EMBEDDINGS_FAISS,
+    FAISS_HNSW_EF_CONSTRUCTION,
+    FAISS_HNSW_M,
     MAX_TEXT_LENGTH,
     METADATA_JSON,
     RECIPENLG_DATASET,
@@ -229,13 +231,16 @@ def build_faiss_index(embeddings):
     dim = embeddings.shape[1]
     logger.info(f"Creating FAISS index with dimension: {dim}")
     
-    # Use IndexFlatL2 for exact nearest neighbor search
-    # L2 distance (Euclidean) works well for sentence-transformer embeddings
-    index = faiss.IndexFlatL2(dim)
+    # Use HNSW with inner product over L2-normalized vectors (== cosine similarity)
+    # Approximate search, but sub-linear per query instead of a full scan
+    embeddings = embeddings.astype('float32')
+    faiss.normalize_L2(embeddings)
+    index = faiss.IndexHNSWFlat(dim, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
     
     # Add embeddings to index
     logger.info(f"Adding {len(embeddings)} embeddings to index...")
-    index.add(embeddings.astype('float32'))
+    index.add(embeddings)
     
     logger.info(f"FAISS index built successfully. Total vectors: {index.ntotal}")
     return index
@@ -273,7 +278,8 @@ def save_artifacts(recipes, embeddings, metadata, index):
     logger.info("Saving metadata...")
     metadata_path = RECIPES_PROCESSED_DIR / METADATA_JSON
     with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+        # json.dumps (not json.dump) encodes in one call on the C encoder; compact separators
+        f.write(json.dumps(metadata, separators=(',', ':')))
     logger.info(f"Saved metadata to {metadata_path}")
     
     logger.info("All artifacts saved successfully!")
@@ -1,4 +1,5 @@
 import os
+from urllib.parse import quote
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -37,6 +38,9 @@ class DataConfig:
     # Vector database backend (local = FAISS, cloud = Qdrant)
     VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "local" if ENV == "dev" else "qdrant")
     
+    # torch.compile the embedding transformer when generating embeddings on CUDA
+    EMBEDDING_TORCH_COMPILE = os.getenv("EMBEDDING_TORCH_COMPILE", "false").lower() == "true"
+    
     # Dataset size limits (dev uses subset for speed)
     # 0 = no limit (use all data)
     RECIPE_LIMIT = int(os.getenv("RECIPE_LIMIT", "10000" if ENV == "dev" else "0"))
@@ -71,6 +75,7 @@ class BackendConfig:
     CLERK_PUBLISHABLE_KEY = os.getenv("CLERK_PUBLISHABLE_KEY", "")
     CLERK_SECRET_KEY = os.getenv("CLERK_SECRET_KEY", "")
     CLERK_JWT_VERIFICATION_KEY = os.getenv("CLERK_JWT_VERIFICATION_KEY", "")  # PEM public key
+    CLERK_JWT_AUDIENCE = os.getenv("CLERK_JWT_AUDIENCE", "")  # Optional - only if a JWT template sets aud
     
     # Redis
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -79,7 +84,7 @@ class BackendConfig:
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
     REDIS_URL = os.getenv(
         "REDIS_URL",
-        f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}" if REDIS_PASSWORD
+        f"redis://:{quote(REDIS_PASSWORD, safe='')}@{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}" if REDIS_PASSWORD
         else f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
     )
     
@@ -88,6 +93,9 @@ class BackendConfig:
     CELERY_RESULT_BACKEND = REDIS_URL
     CELERY_TASK_TRACK_STARTED = True
     CELERY_TASK_TIME_LIMIT = 300  # 5 minutes max per task
+    # Worker threads - tasks mostly wait on LLM / vector DB calls; kept low to fit
+    # the worker task size (256 CPU units / 2 GB)
+    CELERY_WORKER_CONCURRENCY = int(os.getenv("CELERY_WORKER_CONCURRENCY", "2"))
     
     # LLM cache settings
     LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))  # 1 hour default
@@ -96,6 +104,16 @@ class BackendConfig:
     MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", "10485760"))  # 10MB default
     ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/jpg", "image/webp"]
     
+    # Pantry detector (YOLO) inference
+    # Export/serve a TensorRT FP16 engine - CUDA only, CPU-only dev keeps the .pt checkpoint
+    YOLO_TENSORRT = os.getenv("YOLO_TENSORRT", "false").lower() == "true"
+    # Replay a captured CUDA graph for single-image batches (CUDA, non-TensorRT only)
+    YOLO_CUDA_GRAPH = os.getenv("YOLO_CUDA_GRAPH", "false").lower() == "true"
+    # torch.compile the PyTorch forward pass (any device, ignored with TensorRT)
+    YOLO_TORCH_COMPILE = os.getenv("YOLO_TORCH_COMPILE", "false").lower() == "true"
+    # Load the detector at API startup instead of on the first scan (may export / download the model)
+    YOLO_PRELOAD = os.getenv("YOLO_PRELOAD", "false").lower() == "true"
+    
     # Supabase Storage buckets
     PANTRY_IMAGES_BUCKET = os.getenv("PANTRY_IMAGES_BUCKET", "pantry-images")
     